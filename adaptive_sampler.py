@@ -0,0 +1,109 @@
+"""
+adaptive_sampler.py
+-------------------
+Question picker for the Adaptive quiz mode.
+Each question gets a weight from the user's history: questions they often get wrong, have never
+seen, or have not seen for a while come up more often. The weights live in arrays aligned with the
+QuestionStore positions, so choosing a quiz from a large pool is a few vectorized NumPy operations.
+"""
+import numpy as np
+import pandas as pd
+
+import database_manager as db
+
+# Days after which a question counts as fully "stale" again
+STALE_DAYS = 14.0
+_EPOCH = pd.Timestamp("1970-01-01")
+
+
+def _seconds(timestamps):
+    """Local 'YYYY-MM-DD HH:MM' strings (as saved with results) to float seconds, NaN if missing."""
+    parsed = pd.to_datetime(pd.Series(timestamps, dtype=object), errors="coerce")
+    return np.array((parsed - _EPOCH) / pd.Timedelta(seconds=1), dtype=np.float64)
+
+
+def _now():
+    return (pd.Timestamp.now() - _EPOCH) / pd.Timedelta(seconds=1)
+
+
+def _lookup(sorted_ids, ids):
+    """Positions of ids in sorted_ids, and which of them are actually there."""
+    if len(sorted_ids) == 0:
+        return np.zeros(len(ids), dtype=np.int64), np.zeros(len(ids), dtype=bool)
+    pos = np.searchsorted(sorted_ids, ids).clip(0, len(sorted_ids) - 1)
+    return pos, sorted_ids[pos] == ids
+
+
+class AdaptiveSampler:
+    """Per-user question history, loaded once and kept current with record() after every quiz."""
+
+    def __init__(self, username):
+        self.username = username
+        rows = sorted(db.get_user_question_stats(username))
+        self.question_ids = np.array([r[0] for r in rows], dtype=np.int64)
+        self.attempts = np.array([r[1] for r in rows], dtype=np.float64)
+        self.wrong = np.array([r[2] for r in rows], dtype=np.float64)
+        self.last_seen = _seconds([r[3] for r in rows])
+        self._store = None
+
+    def _align(self, store):
+        """Spreads the history over the store's positions (redone only when the question bank changes)."""
+        if self._store is store:
+            return
+        n = len(store)
+        self._pos_attempts = np.zeros(n)
+        self._pos_wrong = np.zeros(n)
+        self._pos_seen = np.full(n, np.nan)
+        if len(self.question_ids):
+            pos, found = _lookup(store.ids, self.question_ids)
+            self._pos_attempts[pos[found]] = self.attempts[found]
+            self._pos_wrong[pos[found]] = self.wrong[found]
+            self._pos_seen[pos[found]] = self.last_seen[found]
+        self._store = store
+
+    def weights(self, store, positions, now=None):
+        """Sampling weight of each position: smoothed error rate times a staleness boost."""
+        self._align(store)
+        now = _now() if now is None else now
+        # Unseen questions start at an error rate of 0.5
+        error_rate = (self._pos_wrong[positions] + 1.0) / (self._pos_attempts[positions] + 2.0)
+        days = (now - self._pos_seen[positions]) / 86400.0
+        staleness = np.where(np.isnan(days), 1.0, np.clip(days / STALE_DAYS, 0.0, 1.0))
+        return error_rate * (0.5 + staleness)
+
+    def sample(self, store, pool, k, rng=None):
+        """k distinct positions from pool, drawn with probability proportional to their weights.
+        Weighted sampling without replacement via Efraimidis-Spirakis keys: the k largest u**(1/w) win."""
+        pool = np.asarray(pool, dtype=np.int64)
+        k = min(k, len(pool))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        rng = np.random.default_rng() if rng is None else rng
+        keys = np.log(rng.random(len(pool))) / self.weights(store, pool)
+        top = np.argpartition(keys, len(pool) - k)[len(pool) - k:]
+        return pool[top]
+
+    def record(self, question_ids, correct, when=None):
+        """Adds one quiz's answers to the in-memory history (the database copy is written by save_quiz_results)."""
+        when = _now() if when is None else when
+        question_ids = np.asarray(question_ids, dtype=np.int64)
+        wrong = (~np.asarray(correct, dtype=bool)).astype(np.float64)
+        pos, known = _lookup(self.question_ids, question_ids)
+        self.attempts[pos[known]] += 1
+        self.wrong[pos[known]] += wrong[known]
+        self.last_seen[pos[known]] = when
+        if (~known).any():
+            # First answers to these questions: insert them, keeping question_ids sorted
+            new_ids = question_ids[~known]
+            ids = np.concatenate([self.question_ids, new_ids])
+            order = np.argsort(ids, kind="stable")
+            self.question_ids = ids[order]
+            self.attempts = np.concatenate([self.attempts, np.ones(len(new_ids))])[order]
+            self.wrong = np.concatenate([self.wrong, wrong[~known]])[order]
+            self.last_seen = np.concatenate([self.last_seen, np.full(len(new_ids), when)])[order]
+        # Patch the position-aligned copy too, if there is one
+        if self._store is not None:
+            spos, hit = _lookup(self._store.ids, question_ids)
+            self._pos_attempts[spos[hit]] += 1
+            self._pos_wrong[spos[hit]] += wrong[hit]
+            self._pos_seen[spos[hit]] = when
@@ -1,15 +1,13 @@
-import sqlite3
-from database_manager import DB_NAME
-import bcrypt
+from database_manager import transaction
 
 def delete_question(q_id):
-    conn = sqlite3.connect(DB_NAME); conn.execute("DELETE FROM questions WHERE rowid = ?", (q_id,)); conn.commit(); conn.close()
+    with transaction() as conn: conn.execute("DELETE FROM questions WHERE rowid = ?", (q_id,))
 
 def update_question(r_id, data):
-    conn = sqlite3.connect(DB_NAME)
-    conn.execute("""UPDATE questions SET Category=?, Subject=?, Question=?, Option1=?, Option2=?, Option3=?, Option4=?, Answer=? WHERE rowid=?""", (*data, r_id))
-    conn.commit(); conn.close()
+    with transaction() as conn:
+        conn.execute("""UPDATE questions SET Category=?, Subject=?, Question=?, Option1=?, Option2=?, Option3=?, Option4=?, Answer=? WHERE rowid=?""", (*data, r_id))
 
 def add_admin(u, p):
+    import bcrypt
     hashed = bcrypt.hashpw(p.encode('utf-8'), bcrypt.gensalt())
-    conn = sqlite3.connect(DB_NAME); conn.execute("INSERT INTO users (username, password, is_admin) VALUES (?, ?, 1)", (u, hashed)); conn.commit(); conn.close()
\ No newline at end of file
+    with transaction() as conn: conn.execute("INSERT INTO users (username, password, is_admin) VALUES (?, ?, 1)", (u, hashed))
\ No newline at end of file
@@ -0,0 +1,148 @@
+"""
+async_tasks.py
+--------------
+Runs slow work (SQLite queries, searches) off the Tk main loop.
+Results are picked up on the UI thread with root.after(), so callbacks can touch widgets safely.
+"""
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+_executor = None
+
+
+def get_executor():
+    """Shared worker pool, created on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prepify-worker")
+    return _executor
+
+
+class Task:
+    """Handle for one background job. cancel() drops its callbacks and stops it if it has not started yet."""
+
+    def __init__(self, future, on_done, on_error, screen_bound):
+        self.future = future
+        self.on_done = on_done
+        self.on_error = on_error
+        self.screen_bound = screen_bound
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        self.future.cancel()
+
+
+class TaskRunner:
+    """Runs functions on the worker pool and hands their results to callbacks on the Tk thread.
+    One root.after() poll loop serves every pending task and stops when nothing is pending."""
+
+    def __init__(self, root, poll_ms=20):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._tasks = []
+        self._polling = []
+        self._after_id = None
+
+    def submit(self, fn, *args, on_done=None, on_error=None, screen_bound=True):
+        """Runs fn(*args) in the background. on_done(result) / on_error(exc) run on the UI thread.
+        screen_bound tasks are cancelled by cancel_screen_tasks() when the user navigates away;
+        pass screen_bound=False for work that must finish (e.g. saving results)."""
+        future = get_executor().submit(fn, *args)
+        task = Task(future, on_done, on_error, screen_bound)
+        self._tasks.append(task)
+        if self._after_id is None:
+            self._after_id = self.root.after(self.poll_ms, self._poll)
+        return task
+
+    def cancel_screen_tasks(self):
+        """Called on navigation: results for the old screen are no longer wanted."""
+        for task in self._tasks + self._polling:
+            if task.screen_bound:
+                task.cancel()
+
+    def _poll(self):
+        self._after_id = None
+        # Callbacks below may submit new tasks, those land in the fresh list
+        self._polling, self._tasks = self._tasks, []
+        for task in self._polling:
+            if task.cancelled:
+                continue
+            if not task.future.done():
+                self._tasks.append(task)
+                continue
+            # Check again: an earlier callback in this loop may have navigated away
+            if task.cancelled:
+                continue
+            try:
+                try:
+                    result = task.future.result()
+                except Exception as e:
+                    if task.on_error:
+                        task.on_error(e)
+                    else:
+                        print(f"Background Task Error: {e}")
+                    continue
+                if task.on_done:
+                    task.on_done(result)
+            except Exception:
+                # A failing callback must not stop results for the other tasks
+                traceback.print_exc()
+        self._polling = []
+        if self._tasks and self._after_id is None:
+            self._after_id = self.root.after(self.poll_ms, self._poll)
+
+
+class DebouncedSearch:
+    """Runs search_fn(query) on a worker thread once typing pauses for delay_ms.
+    Only the newest query's results reach on_results; older ones are dropped."""
+
+    def __init__(self, runner, search_fn, on_results, delay_ms=250):
+        self.runner = runner
+        self.root = runner.root
+        self.search_fn = search_fn
+        self.on_results = on_results
+        self.delay_ms = delay_ms
+        self._generation = 0
+        self._after_id = None
+        self._task = None
+
+    def submit(self, query, immediate=False):
+        """Call on every keystroke. Restarts the debounce timer and invalidates older queries."""
+        self._generation += 1
+        generation = self._generation
+        self._cancel_pending()
+        delay = 0 if immediate else self.delay_ms
+        self._after_id = self.root.after(delay, lambda: self._start(query, generation))
+
+    def cancel(self):
+        """Drops the pending and in-flight query (e.g. when the screen closes)."""
+        self._generation += 1
+        self._cancel_pending()
+
+    def _cancel_pending(self):
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        if self._task is not None:
+            # A newer query was issued, the running one is stale
+            self._task.cancel()
+            self._task = None
+
+    def _start(self, query, generation):
+        self._after_id = None
+        if generation != self._generation:
+            return
+        self._task = self.runner.submit(
+            self.search_fn, query,
+            on_done=lambda results: self._deliver(results, generation),
+            on_error=lambda e: print(f"Search Error: {e}")
+        )
+
+    def _deliver(self, results, generation):
+        if generation == self._generation:
+            self._task = None
+            self.on_results(results)
@@ -0,0 +1,124 @@
+"""
+attempt_log.py
+--------------
+Append-only log of every answer given during a quiz.
+record() only puts the attempt on a queue; a background thread writes them to question_attempts
+in batches, so the Next button never waits for SQLite. Pending attempts are flushed every few
+seconds, when a quiz finishes and when the app closes.
+"""
+import datetime
+import queue
+import threading
+
+import database_manager as db
+
+
+class QuizSession:
+    """One quiz being taken. id is assigned by the writer thread when the session row is written.
+    A discarded session is skipped by the writer: nothing more of it reaches the database."""
+
+    def __init__(self, username):
+        self.username = username
+        self.started_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.id = None
+        self.discarded = False
+
+
+class AttemptLog:
+    def __init__(self, flush_interval=2.0, batch_size=50):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._closed = False
+        # Held while a batch is written, so discard() never races with a write of the same session
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="prepify-attempt-log", daemon=True)
+        self._thread.start()
+
+    def start_session(self, username):
+        session = QuizSession(username)
+        self._queue.put(("session", session))
+        return session
+
+    def record(self, session, question_id, chosen, is_correct, time_spent=None):
+        """Queues one answer. Never touches the database on the calling thread."""
+        answered_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._queue.put(("attempt", session, (int(question_id), chosen, int(bool(is_correct)), time_spent, answered_at)))
+
+    def flush(self, timeout=None):
+        """Blocks until everything recorded so far is written. Returns False on timeout."""
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        return done.wait(timeout)
+
+    def discard(self, session):
+        """Stops writing this session (e.g. its result is saved without the log after a flush timeout).
+        Returns the session's id if part of it was already written, else None."""
+        with self._lock:
+            session.discarded = True
+            return session.id
+
+    def close(self, timeout=5.0):
+        """Writes what is left and stops the writer thread (called when the app closes)."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(("stop", None))
+        self._thread.join(timeout)
+
+    def _run(self):
+        pending, waiters = [], []
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
+            stop = False
+            if item is not None:
+                if item[0] == "flush":
+                    waiters.append(item[1])
+                elif item[0] == "stop":
+                    stop = True
+                else:
+                    pending.append(item)
+            # Write when idle for flush_interval, when the batch is full, or when asked to
+            if pending and (item is None or waiters or stop or len(pending) >= self.batch_size):
+                if self._write(pending):
+                    pending = []
+            if not pending or stop:
+                for done in waiters:
+                    done.set()
+                waiters = []
+            if stop:
+                return
+
+    def _write(self, items):
+        """Writes sessions and attempts in queue order, in one transaction. Returns False to retry later."""
+        created = []
+        try:
+            with self._lock, db.transaction() as conn:
+                rows = []
+                for item in items:
+                    if item[1].discarded:
+                        continue
+                    if item[0] == "session":
+                        session = item[1]
+                        if session.id is None:
+                            cur = conn.execute("INSERT INTO quiz_sessions (username, started_at) VALUES (?, ?)",
+                                               (session.username, session.started_at))
+                            session.id = cur.lastrowid
+                            created.append(session)
+                    else:
+                        _, session, attempt = item
+                        rows.append((session.id, session.username) + attempt)
+                conn.executemany("""
+                    INSERT INTO question_attempts (session_id, username, question_id, chosen, is_correct, time_spent, answered_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+            return True
+        except Exception as e:
+            # The batch stays queued in memory and is retried on the next flush
+            for session in created:
+                session.id = None
+            print(f"Attempt Log Error: {e}")
+            return False
@@ -1,13 +1,12 @@
 import sqlite3
-import bcrypt
-from database_manager import DB_NAME
+from database_manager import get_conn, transaction
 
 def handle_login_db(u, p):
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
+    # bcrypt is only needed once someone logs in, so it stays off the startup path
+    import bcrypt
+    cursor = get_conn().cursor()
     cursor.execute("SELECT password, is_admin, username FROM users WHERE username=?", (u,))
     row = cursor.fetchone()
-    conn.close()
 
     if row:
         stored_hash = row[0]
@@ -22,14 +21,13 @@ def handle_login_db(u, p):
     return False, 0, None
 
 def handle_register_db(u, p):
+    import bcrypt
     # This generates bytes
     hashed = bcrypt.hashpw(p.encode('utf-8'), bcrypt.gensalt())
     try:
-        conn = sqlite3.connect(DB_NAME)
-        # We store the 'hashed' bytes directly into the database
-        conn.execute("INSERT INTO users (username, password, is_admin) VALUES (?, ?, 0)", (u, hashed))
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            # We store the 'hashed' bytes directly into the database
+            conn.execute("INSERT INTO users (username, password, is_admin) VALUES (?, ?, 0)", (u, hashed))
         return True
     except sqlite3.Error: # Better to catch specific DB errors
         return False
@@ -37,13 +35,15 @@ def handle_register_db(u, p):
 def delete_user_from_db(username):
     """Permanently deletes a user and their associated data."""
     try:
-        conn = sqlite3.connect(DB_NAME)
-        conn.execute("DELETE FROM users WHERE username = ?", (username,))
-        # Clean up related history so the database stays healthy
-        conn.execute("DELETE FROM quiz_history WHERE username = ?", (username,))
-        conn.execute("DELETE FROM subject_performance WHERE username = ?", (username,))
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            conn.execute("DELETE FROM users WHERE username = ?", (username,))
+            # Clean up related history so the database stays healthy
+            conn.execute("DELETE FROM quiz_history WHERE username = ?", (username,))
+            conn.execute("DELETE FROM subject_performance WHERE username = ?", (username,))
+            conn.execute("DELETE FROM question_attempts WHERE username = ?", (username,))
+            conn.execute("DELETE FROM quiz_sessions WHERE username = ?", (username,))
+            conn.execute("DELETE FROM user_question_stats WHERE username = ?", (username,))
+            conn.execute("DELETE FROM review_schedule WHERE username = ?", (username,))
         return True
     except Exception as e:
         print(f"Auth DB Error (Delete): {e}")
@@ -51,32 +51,28 @@ def delete_user_from_db(username):
 
 def reset_password_in_db(username, new_password):
     """Hashes the new password and updates the database record."""
+    import bcrypt
     hashed = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt())
     try:
-        conn = sqlite3.connect(DB_NAME)
-        conn.execute("UPDATE users SET password = ? WHERE username = ?", (hashed, username))
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            conn.execute("UPDATE users SET password = ? WHERE username = ?", (hashed, username))
         return True
     except Exception as e:
         print(f"Auth DB Error (Reset): {e}")
         return False
 
 def add_admin_db(u, p):
+    import bcrypt
     hashed = bcrypt.hashpw(p.encode('utf-8'), bcrypt.gensalt())
-    conn = sqlite3.connect(DB_NAME)
-    conn.execute("INSERT INTO users (username, password, is_admin) VALUES (?, ?, 1)", (u, hashed))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("INSERT INTO users (username, password, is_admin) VALUES (?, ?, 1)", (u, hashed))
 
 def add_admin_db(u, p):
     import bcrypt
     hashed = bcrypt.hashpw(p.encode('utf-8'), bcrypt.gensalt())
     try:
-        conn = sqlite3.connect(DB_NAME)
-        conn.execute("INSERT INTO users (username, password, is_admin) VALUES (?, ?, 1)", (u, hashed))
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            conn.execute("INSERT INTO users (username, password, is_admin) VALUES (?, ?, 1)", (u, hashed))
         return True
     except Exception as e:
         print(f"Error adding admin: {e}")
@@ -0,0 +1,79 @@
+"""
+question_store_memory.py
+------------------------
+Compares the memory used by the question bank as a plain DataFrame (what db.get_questions() returns)
+with the compact QuestionStore the app keeps in QuizApp.question_store, and with the lazy
+store (ids and metadata only) used for large banks.
+
+    python benchmarks/question_store_memory.py --rows 200000
+    python benchmarks/question_store_memory.py --db prepify.db
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from question_store import QuestionStore
+
+WORDS = ("cell", "energy", "bond", "force", "enzyme", "molecule", "reaction", "vector", "current",
+         "protein", "acid", "velocity", "membrane", "equation", "pressure", "nucleus", "wave", "mass")
+SUBJECTS = {"MDCAT": ("Biology", "Chemistry", "Physics", "English"),
+            "ECAT": ("Math", "Physics", "Chemistry", "English")}
+
+
+def make_bank(rows, seed=7):
+    """In-memory SQLite bank with realistic-looking MCQs, read back the same way the app does."""
+    rnd = random.Random(seed)
+    conn = sqlite3.connect(":memory:")
+    conn.execute("""CREATE TABLE questions (Category TEXT, Subject TEXT, Question TEXT,
+                    Option1 TEXT, Option2 TEXT, Option3 TEXT, Option4 TEXT, Answer TEXT)""")
+
+    def phrase(n):
+        return " ".join(rnd.choice(WORDS) for _ in range(n))
+
+    data = []
+    for _ in range(rows):
+        cat = rnd.choice(tuple(SUBJECTS))
+        options = [phrase(rnd.randint(1, 4)) for _ in range(4)]
+        data.append((cat, rnd.choice(SUBJECTS[cat]), phrase(rnd.randint(8, 25)) + "?", *options, rnd.choice(options)))
+    conn.executemany("INSERT INTO questions VALUES (?,?,?,?,?,?,?,?)", data)
+    return conn
+
+
+def load_frame(conn):
+    # Same query and post-processing as database_manager.get_questions()
+    df = pd.read_sql_query("SELECT rowid, * FROM questions", conn, index_col="rowid").fillna("N/A")
+    df.columns = [c.capitalize() for c in df.columns]
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000, help="synthetic bank size")
+    parser.add_argument("--db", help="measure a real database file instead of a synthetic bank")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db) if args.db else make_bank(args.rows)
+    df = load_frame(conn)
+
+    start = time.perf_counter()
+    store = QuestionStore.from_frame(df)
+    build_s = time.perf_counter() - start
+
+    frame_bytes = int(df.memory_usage(deep=True, index=True).sum())
+    store_bytes = store.nbytes
+    lazy_bytes = QuestionStore.from_meta(df[["Category", "Subject"]], text_cache=None).nbytes
+    print(f"questions:        {len(df):>12,}")
+    print(f"DataFrame:        {frame_bytes / 2**20:>12.1f} MiB")
+    print(f"QuestionStore:    {store_bytes / 2**20:>12.1f} MiB  ({frame_bytes / max(store_bytes, 1):.1f}x smaller)")
+    print(f"lazy store:       {lazy_bytes / 2**20:>12.1f} MiB  (text fetched per quiz)")
+    print(f"store build time: {build_s * 1000:>12.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
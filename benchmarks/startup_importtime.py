@@ -0,0 +1,120 @@
+"""
+startup_importtime.py
+---------------------
+Measures the cold-start import cost of the app: everything `import main` pulls in before the
+welcome screen can be drawn. Each run is a fresh interpreter with `python -X importtime`, so the
+numbers include module search and bytecode loading, like a real launch.
+
+Results are appended to a CSV history, so regressions show up as the tree changes over time.
+
+    python benchmarks/startup_importtime.py
+    python benchmarks/startup_importtime.py --runs 10 --top 20
+    python benchmarks/startup_importtime.py --no-save
+"""
+import argparse
+import csv
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY = os.path.join(ROOT, "benchmarks", "startup_history.csv")
+# Modules that should only be loaded after the welcome screen is up
+HEAVY_MODULES = ("pandas", "matplotlib", "reportlab", "bcrypt")
+
+
+def parse_importtime(stderr):
+    """{module: (self_us, cumulative_us)} from -X importtime output."""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def measure(module="main"):
+    """One cold start in a fresh interpreter. Returns (wall seconds, timings)."""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+    return wall, parse_importtime(proc.stderr)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip() or "-"
+    except OSError:
+        return "-"
+
+
+def last_entry(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    return rows[-1] if rows else None
+
+
+def save_entry(path, entry):
+    new = not os.path.exists(path)
+    with open(path, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(entry))
+        if new:
+            writer.writeheader()
+        writer.writerow(entry)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to start (the median is reported)")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    parser.add_argument("--module", default="main", help="module to import (default: the app)")
+    parser.add_argument("--history", default=HISTORY, help="CSV file the results are appended to")
+    parser.add_argument("--no-save", action="store_true", help="do not append to the history")
+    args = parser.parse_args()
+
+    # One warm-up start so the first run does not pay for writing .pyc files
+    measure(args.module)
+    runs = [measure(args.module) for _ in range(max(args.runs, 1))]
+    walls = [wall for wall, _ in runs]
+    imports = [timings[args.module][1] / 1000 for _, timings in runs if args.module in timings]
+    timings = runs[walls.index(statistics.median_low(walls))][1]
+
+    print(f"cold start (wall):     {statistics.median(walls) * 1000:>8.0f} ms  (min {min(walls) * 1000:.0f} ms, {len(walls)} runs)")
+    print(f"import {args.module} (cumulative): {statistics.median(imports):>5.0f} ms")
+    loaded = [name for name in HEAVY_MODULES if name in timings]
+    print(f"heavy modules at startup: {', '.join(loaded) if loaded else 'none'}")
+    print("\nslowest modules (cumulative):")
+    for name, (self_us, cumulative_us) in sorted(timings.items(), key=lambda kv: -kv[1][1])[:args.top]:
+        print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+    previous = last_entry(args.history)
+    entry = {
+        "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "runs": len(walls),
+        "wall_ms": round(statistics.median(walls) * 1000, 1),
+        "import_ms": round(statistics.median(imports), 1),
+        "heavy_modules": " ".join(loaded),
+    }
+    if previous:
+        delta = entry["wall_ms"] - float(previous["wall_ms"])
+        print(f"\nprevious run ({previous['revision']}, {previous['date']}): {previous['wall_ms']} ms ({delta:+.0f} ms)")
+    if not args.no_save:
+        save_entry(args.history, entry)
+        print(f"saved to {os.path.relpath(args.history, ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+chart_service.py
+----------------
+Long-lived matplotlib charts for the Tk screens.
+Each chart type has one Figure and one canvas. New data goes into the existing artists
+(Line2D.set_data, wedge angles), and the figure is not rebuilt. Figures are created with
+matplotlib.figure.Figure rather than pyplot, so pyplot keeps no reference to them; a chart whose
+screen is destroyed is simply garbage collected.
+Every rendered frame is cached by its input data. Showing data that was drawn before restores
+that image and blits it, and skips the Agg render.
+"""
+import math
+from collections import OrderedDict
+
+_charts = {}
+
+
+def get_chart(kind, master, factory):
+    """The pooled chart of this kind, if it still lives in master; otherwise factory(master) replaces it.
+    Tk widgets cannot be moved to another parent, so a chart is only reused while its screen is kept
+    (see screen_router.py); a rebuilt screen gets a new figure."""
+    chart = _charts.get(kind)
+    if chart is None or not chart.alive() or chart.master is not master:
+        chart = factory(master)
+        _charts[kind] = chart
+    return chart
+
+
+class PooledChart:
+    def __init__(self, master, figure, canvas_class=None, cache_size=8):
+        if canvas_class is None:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg as canvas_class
+        self.master = master
+        self.figure = figure
+        self.canvas = canvas_class(figure, master=master) if master is not None else canvas_class(figure)
+        self.cache_size = cache_size
+        self._images = OrderedDict()
+        self._shown = None
+
+    def alive(self):
+        widget = getattr(self.canvas, "get_tk_widget", None)
+        return widget is None or bool(widget().winfo_exists())
+
+    def render(self, key):
+        """Puts the current artists on screen: from the image cache if this key was drawn before."""
+        key = (key, tuple(self.canvas.get_width_height()))
+        if key == self._shown:
+            return
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            self.canvas.restore_region(image)
+            self.canvas.blit(self.figure.bbox)
+        else:
+            self.canvas.draw()
+            self._images[key] = self.canvas.copy_from_bbox(self.figure.bbox)
+            while len(self._images) > self.cache_size:
+                self._images.popitem(last=False)
+        self._shown = key
+
+
+class LineChart(PooledChart):
+    """Score-over-time line (the Progress screen), with an optional rolling average and min/max band."""
+
+    MARKER_LIMIT = 40
+
+    def __init__(self, master, canvas_class=None):
+        from matplotlib.figure import Figure
+        from matplotlib.patches import Polygon
+        from matplotlib.ticker import MaxNLocator
+        figure = Figure(figsize=(8, 4), dpi=100)
+        figure.patch.set_alpha(0.0)
+        super().__init__(master, figure, canvas_class)
+        self.ax = figure.add_subplot()
+        self.band = self.ax.add_patch(Polygon([[0, 0], [0, 0], [0, 0]], closed=True, color='#3B8ED0',
+                                              alpha=0.15, linewidth=0, visible=False))
+        self.line, = self.ax.plot([], [], marker='o', color='#3B8ED0', linewidth=3)
+        self.rolling, = self.ax.plot([], [], color='#E67E22', linewidth=2, linestyle='--', visible=False)
+        self.ax.set_ylim(0, 105)
+        # A handful of whole quiz numbers, however many quizzes are shown
+        self.ax.xaxis.set_major_locator(MaxNLocator(nbins=10, integer=True))
+        self.ax.set_xlabel("Quiz Number")
+        self.ax.set_ylabel("Score %")
+        self.ax.grid(True, linestyle='--', alpha=0.6)
+
+    def set_data(self, x, y, rolling=None, band=None):
+        """band is (x, low, high); rolling shares x with the line. Both are hidden when None."""
+        x, y = [float(v) for v in x], [float(v) for v in y]
+        self.line.set_data(x, y)
+        # Long (downsampled) series: a thin line without markers, so the rolling average and band stay readable
+        few = len(x) <= self.MARKER_LIMIT
+        self.line.set_marker('o' if few else '')
+        self.line.set_linewidth(3 if few else 1.2)
+        if x:
+            pad = max((x[-1] - x[0]) * 0.05, 0.5)
+            self.ax.set_xlim(x[0] - pad, x[-1] + pad)
+        rolling = None if rolling is None else tuple(float(v) for v in rolling)
+        self.rolling.set_visible(rolling is not None)
+        if rolling is not None:
+            self.rolling.set_data(x, rolling)
+        band = None if band is None else tuple(tuple(float(v) for v in part) for part in band)
+        self.band.set_visible(band is not None and len(band[0]) > 1)
+        if self.band.get_visible():
+            bx, low, high = band
+            self.band.set_xy(list(zip(bx, high)) + list(zip(bx[::-1], low[::-1])))
+        self.render((tuple(x), tuple(y), rolling, band))
+        return self.canvas
+
+
+class PieChart(PooledChart):
+    """Correct/incorrect pie (the Results screen). The two wedges and their labels are moved, not redrawn from scratch."""
+
+    COLORS = ('#4CAF50', '#E91E63')
+    LABELS = ('Correct', 'Incorrect')
+
+    def __init__(self, master, canvas_class=None):
+        from matplotlib.figure import Figure
+        figure = Figure(figsize=(5, 4), dpi=100)
+        super().__init__(master, figure, canvas_class)
+        self.ax = figure.add_subplot()
+        self.wedges, self.labels, self.pcts = self.ax.pie(
+            [1, 1], labels=self.LABELS, autopct='%1.1f%%', startangle=90,
+            colors=self.COLORS, textprops={'fontsize': 10})
+        self.ax.axis('equal')
+        figure.tight_layout(pad=2.0)
+
+    def set_data(self, score, total, appearance_mode):
+        # 1. Match the card's grey background and text color
+        light = appearance_mode.lower() == "light"
+        bg_hex = "#ebebeb" if light else "#2b2b2b"
+        text_col = "black" if light else "white"
+        self.figure.set_facecolor(bg_hex)
+        self.ax.set_facecolor(bg_hex)
+        widget = getattr(self.canvas, "get_tk_widget", None)
+        if widget is not None:
+            widget().configure(bg=bg_hex, highlightthickness=0, borderwidth=0)
+        # 2. Same geometry as ax.pie(startangle=90): counter-clockwise from the top
+        sizes = (score, total - score)
+        whole = float(sum(sizes)) or 1.0
+        theta = 90.0
+        for wedge, label, pct, size in zip(self.wedges, self.labels, self.pcts, sizes):
+            span = 360.0 * size / whole
+            wedge.set_theta1(theta)
+            wedge.set_theta2(theta + span)
+            mid = math.radians(theta + span / 2)
+            x, y = math.cos(mid), math.sin(mid)
+            label.set_position((1.1 * x, 1.1 * y))
+            label.set_horizontalalignment('left' if x > 0 else 'right')
+            pct.set_position((0.6 * x, 0.6 * y))
+            pct.set_text(f"{100.0 * size / whole:.1f}%")
+            for artist in (wedge, label, pct):
+                artist.set_visible(size > 0)
+            label.set_color(text_col)
+            pct.set_color(text_col)
+            theta += span
+        self.render((score, total, light))
+        return self.canvas
@@ -0,0 +1,86 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# Pragmas applied once to every new connection.
+# WAL lets the UI read while a background save is writing, NORMAL sync is safe under WAL,
+# and a bigger page cache / mmap keeps large question banks in memory between screens.
+DEFAULT_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("cache_size", -32000),       # ~32 MB page cache (negative value = KiB)
+    ("mmap_size", 268435456),     # 256 MB memory-mapped I/O
+    ("temp_store", "MEMORY"),
+    ("busy_timeout", 5000),
+)
+
+
+class ConnectionManager:
+    """Hands out one long-lived SQLite connection per thread for a database file."""
+
+    def __init__(self, db_name, pragmas=DEFAULT_PRAGMAS):
+        self.db_name = db_name
+        self.pragmas = pragmas
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all_conns = []
+
+    def _open(self):
+        # check_same_thread=False only so close_all() can run from the UI thread at exit,
+        # each connection is still used by the single thread that created it.
+        conn = sqlite3.connect(self.db_name, check_same_thread=False, cached_statements=256)
+        for name, value in self.pragmas:
+            conn.execute(f"PRAGMA {name} = {value}")
+        with self._lock:
+            self._all_conns.append(conn)
+        return conn
+
+    def get(self):
+        """Returns this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            self._local.depth = 0
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Commits on success and rolls back on error. Nested blocks join the outer transaction."""
+        conn = self.get()
+        if self._local.depth == 0 and conn.in_transaction:
+            # Finish any implicit transaction left open by a plain read/write call
+            conn.commit()
+        self._local.depth += 1
+        try:
+            yield conn
+        except BaseException:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                conn.rollback()
+            raise
+        else:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                conn.commit()
+
+    def close_thread(self):
+        """Closes the connection owned by the calling thread (used by worker threads on exit)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            with self._lock:
+                if conn in self._all_conns:
+                    self._all_conns.remove(conn)
+            conn.close()
+            self._local.conn = None
+
+    def close_all(self):
+        """Closes every connection opened by this manager (call once when the app exits)."""
+        with self._lock:
+            conns, self._all_conns = self._all_conns, []
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
@@ -1,94 +1,132 @@
 import datetime
+import re
 import sqlite3
 from unittest import case
-import pandas as pd
 from tkinter import messagebox
-import bcrypt
+
+from connection_manager import ConnectionManager
+from schema_migrations import FTS_COLUMNS, migrate
+from spaced_repetition import TIME_FORMAT, update_review_schedule
 
 DB_NAME = "prepify.db"
 
+# One long-lived connection per thread, shared by database_manager, auth_manager and admin_logic
+pool = ConnectionManager(DB_NAME)
+
 def get_conn():
-    return sqlite3.connect(DB_NAME)
+    """Returns the calling thread's pooled connection. Do not close it."""
+    return pool.get()
+
+def transaction():
+    """Context manager for writes: commits on success, rolls back on error."""
+    return pool.transaction()
+
+def close_db():
+    """Closes every pooled connection. Called once when the app shuts down."""
+    pool.close_all()
 
 def init_db():
-    conn = get_conn()
-    # Ensure all tables exist
-    conn.execute("""CREATE TABLE IF NOT EXISTS quiz_history (
-                    username TEXT, score INTEGER, total INTEGER, 
-                    percentage REAL, timestamp DATETIME)""")
-    conn.execute("""CREATE TABLE IF NOT EXISTS subject_performance (
-                    username TEXT, subject TEXT, correct INTEGER, 
-                    total INTEGER, timestamp DATETIME)""")
-    conn.execute("""CREATE TABLE IF NOT EXISTS questions (
-                    Category TEXT, Subject TEXT, Question TEXT, 
-                    Option1 TEXT, Option2 TEXT, Option3 TEXT, 
-                    Option4 TEXT, Answer TEXT)""")
-    conn.execute("""CREATE TABLE IF NOT EXISTS quiz_results (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id TEXT,
-                    subject TEXT,
-                    score_percent REAL,
-                    date TEXT)""")
-    conn.commit()
-    conn.close()
-
-def get_questions():
+    # Creates missing tables and applies any pending schema migrations (see schema_migrations.py)
+    migrate(get_conn())
+
+def get_questions(ids=None, columns="*"):
+    """Loads questions into a DataFrame indexed by rowid (all of them, or only the given rowids)."""
+    # pandas is imported on first use, not at startup
+    import pandas as pd
     try:
         conn = get_conn()
-        df = pd.read_sql_query("SELECT * FROM questions", conn).fillna("N/A")
+        if ids is None:
+            df = pd.read_sql_query(f"SELECT rowid, {columns} FROM questions", conn, index_col="rowid")
+        else:
+            ids = list(ids)
+            # Batch the IN (...) lookups to stay under SQLite's variable limit
+            parts = [pd.read_sql_query(f"SELECT rowid, {columns} FROM questions WHERE rowid IN ({','.join('?' * len(chunk))})",
+                                       conn, params=chunk, index_col="rowid")
+                     for chunk in (ids[i:i + 500] for i in range(0, len(ids), 500))]
+            df = pd.concat(parts) if parts else pd.read_sql_query(f"SELECT rowid, {columns} FROM questions LIMIT 0", conn, index_col="rowid")
+        df = df.fillna("N/A")
         # Ensure column names are capitalized to match dataframe logic
         df.columns = [c.capitalize() for c in df.columns]
-        conn.close()
         return df
     except Exception as e:
         print(f"Database Error: {e}")
         return pd.DataFrame()
 
+def get_question_meta(ids=None):
+    """Only rowid, Category and Subject - what the lazy question bank keeps resident."""
+    return get_questions(ids, columns="Category, Subject")
+
+def get_questions_version():
+    """The question bank's data version: bumped by triggers on every insert, edit or delete."""
+    row = get_conn().execute("SELECT seq FROM sqlite_sequence WHERE name = 'question_changes'").fetchone()
+    return row[0] if row else 0
 
-def get_progress_data(username):
+def get_database_id():
+    """Random id of this database (see schema_migrations._m011_database_identity); '' before migration 11."""
+    try:
+        row = get_conn().execute("SELECT uuid FROM db_identity WHERE id = 1").fetchone()
+    except sqlite3.OperationalError:
+        return ""
+    return row[0] if row else ""
+
+def get_changed_question_ids(since_version):
+    """Rowids changed after since_version, or None if the change log no longer reaches back that far."""
+    conn = get_conn()
+    oldest = conn.execute("SELECT MIN(seq) FROM question_changes").fetchone()[0]
+    if oldest is None:
+        # Empty log: only an up-to-date version needs nothing re-read
+        return [] if since_version >= get_questions_version() else None
+    if oldest > since_version + 1:
+        return None
+    rows = conn.execute("SELECT DISTINCT question_id FROM question_changes WHERE seq > ?", (since_version,)).fetchall()
+    return [r[0] for r in rows]
+
+def prune_question_changes(keep=10000):
+    """Keeps only the newest change-log entries; older caches just fall back to a full reload."""
+    with transaction() as conn:
+        conn.execute("DELETE FROM question_changes WHERE seq <= (SELECT MAX(seq) FROM question_changes) - ?", (keep,))
+
+
+def get_progress_series(username, since=None, window=5):
+    """Every quiz score of the user, oldest first, numbered and with a rolling average over the last
+    `window` quizzes (SQL window functions). since ('YYYY-MM-DD HH:MM') limits the rows returned;
+    quiz numbers and rolling averages still count the quizzes before it."""
+    import pandas as pd
     try:
         conn = get_conn()
+        # The (user_id, date) index already returns the rows in window order
         query = """
-            SELECT SCORE_PERCENT as percentage, DATE as timestamp 
-            FROM quiz_results 
-            WHERE LOWER(USER_ID) = LOWER(?)
-            ORDER BY DATE DESC LIMIT 10
+            SELECT quiz_no, timestamp, day, percentage, rolling FROM (
+                SELECT ROW_NUMBER() OVER w AS quiz_no,
+                       DATE AS timestamp,
+                       julianday(DATE) AS day,
+                       SCORE_PERCENT AS percentage,
+                       AVG(SCORE_PERCENT) OVER (w ROWS BETWEEN ? PRECEDING AND CURRENT ROW) AS rolling
+                FROM quiz_results
+                WHERE USER_ID = ? COLLATE NOCASE AND SCORE_PERCENT IS NOT NULL
+                WINDOW w AS (ORDER BY DATE, ID)
+            )
+            WHERE ? IS NULL OR timestamp >= ?
+            ORDER BY quiz_no
         """
-        df = pd.read_sql_query(query, conn, params=(username,))
-        conn.close()
-        return df
+        return pd.read_sql_query(query, conn, params=(max(window - 1, 0), username, since, since))
     except Exception as e:
         print(f"Error: {e}")
         return pd.DataFrame()
-    
+
 def get_weakest_subject_data(username):
     try:
         conn = get_conn()
-        # We try to find the subject performance data
-        # First, we check if the table exists and use the most likely column names
-        try:
-            query = """
-                SELECT subject, (SUM(correct) * 100.0 / SUM(total)) as avg_acc 
-                FROM subject_performance 
-                WHERE LOWER(username) = LOWER(?) 
-                GROUP BY subject 
-                ORDER BY avg_acc ASC 
-                LIMIT 1
-            """
-            weak_data = conn.execute(query, (username,)).fetchone()
-        except:
-            # Fallback if your table uses 'user' instead of 'username'
-            query = """
-                SELECT subject, (SUM(correct) * 100.0 / SUM(total)) as avg_acc 
-                FROM subject_performance 
-                WHERE LOWER(user) = LOWER(?) 
-                GROUP BY subject 
-                ORDER BY avg_acc ASC 
-                LIMIT 1
-            """
-            weak_data = conn.execute(query, (username,)).fetchone()
-            
-        conn.close() 
+        # subject_performance holds one running total per (username, subject), updated by every save,
+        # so this reads the user's few subject rows from the index instead of aggregating their history
+        query = """
+            SELECT subject, (correct * 100.0 / total) as avg_acc 
+            FROM subject_performance 
+            WHERE username = ? AND total > 0
+            ORDER BY avg_acc ASC 
+            LIMIT 1
+        """
+        weak_data = conn.execute(query, (username,)).fetchone()
         # This will now show the actual data in your terminal
         print(f"DEBUG: Database found for {username}: {weak_data}")
         return weak_data 
@@ -100,13 +138,11 @@ def get_weakest_subject_data(username):
 def add_new_question(category, subject, question, o1, o2, o3, o4, answer):
     """Inserts a new question into the database."""
     try:
-        conn = get_conn()
-        conn.execute("""INSERT INTO questions 
-                        (Category, Subject, Question, Option1, Option2, Option3, Option4, Answer) 
-                        VALUES (?,?,?,?,?,?,?,?)""", 
-                     (category, subject, question, o1, o2, o3, o4, answer))
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            conn.execute("""INSERT INTO questions 
+                            (Category, Subject, Question, Option1, Option2, Option3, Option4, Answer) 
+                            VALUES (?,?,?,?,?,?,?,?)""", 
+                         (category, subject, question, o1, o2, o3, o4, answer))
         return True
     except Exception as e:
         print(f"Error adding question: {e}")
@@ -115,21 +151,21 @@ def add_new_question(category, subject, question, o1, o2, o3, o4, answer):
 def delete_question_by_id(q_id):
     """Permanently removes a question from the database using its rowid."""
     try:
-        conn = get_conn()
-        conn.execute("DELETE FROM questions WHERE rowid = ?", (q_id,))
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            conn.execute("DELETE FROM questions WHERE rowid = ?", (q_id,))
         return True
     except Exception as e:
         print(f"Error deleting question: {e}")
         return False
     
+# Fixed column order for admin rows, so the cards never depend on how the table was created
+MANAGED_QUESTION_COLUMNS = "rowid, Question, Option1, Option2, Option3, Option4, Answer, Category, Subject"
+
 def get_all_questions_with_ids():
     """Fetches every question including the rowid for management purposes."""
     try:
         conn = get_conn()
-        rows = conn.execute("SELECT rowid, * FROM questions").fetchall()
-        conn.close()
+        rows = conn.execute(f"SELECT {MANAGED_QUESTION_COLUMNS} FROM questions").fetchall()
         return rows
     except Exception as e:
         print(f"Error fetching questions list: {e}")
@@ -148,7 +184,6 @@ def get_users_list(current_user, search_query=""):
             
         cursor = conn.execute(query, params)
         users = cursor.fetchall()
-        conn.close()
         return users
     except Exception as e:
         print(f"Error fetching users: {e}")
@@ -157,13 +192,15 @@ def get_users_list(current_user, search_query=""):
 def delete_user_from_db(username):
     """Deletes a user account from the database."""
     try:
-        conn = get_conn()
-        conn.execute("DELETE FROM users WHERE username = ?", (username,))
-        # Also clean up their history to save space
-        conn.execute("DELETE FROM quiz_history WHERE username = ?", (username,))
-        conn.execute("DELETE FROM subject_performance WHERE username = ?", (username,))
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            conn.execute("DELETE FROM users WHERE username = ?", (username,))
+            # Also clean up their history to save space
+            conn.execute("DELETE FROM quiz_history WHERE username = ?", (username,))
+            conn.execute("DELETE FROM subject_performance WHERE username = ?", (username,))
+            conn.execute("DELETE FROM question_attempts WHERE username = ?", (username,))
+            conn.execute("DELETE FROM quiz_sessions WHERE username = ?", (username,))
+            conn.execute("DELETE FROM user_question_stats WHERE username = ?", (username,))
+            conn.execute("DELETE FROM review_schedule WHERE username = ?", (username,))
         return True
     except Exception as e:
         print(f"Error deleting user: {e}")
@@ -176,12 +213,11 @@ def get_recent_activity(username):
         cursor.execute("""
             SELECT SUBJECT, SCORE_PERCENT, DATE 
             FROM quiz_results 
-            WHERE USER_ID = ? 
+            WHERE USER_ID = ? COLLATE NOCASE 
             ORDER BY DATE DESC 
             LIMIT 5
         """, (username,))
         data = cursor.fetchall()
-        conn.close()
         return data
     except Exception as e:
         print(f"DB Error: {e}")
@@ -189,47 +225,160 @@ def get_recent_activity(username):
 
 def reset_password_in_db(username, new_password):
     """Hashes a new password and updates the user's record."""
+    import bcrypt
     hashed = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt())
     try:
-        conn = get_conn()
-        conn.execute("UPDATE users SET password = ? WHERE username = ?", (hashed, username))
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            conn.execute("UPDATE users SET password = ? WHERE username = ?", (hashed, username))
         return True
     except Exception as e:
         print(f"Error resetting password: {e}")
         return False
     
-def get_managed_questions(search_query=""):
-    """Fetches questions with their rowid, supporting the live search filter."""
+# bm25() column weights, same order as FTS_COLUMNS: question text ranks above subject, category and options
+FTS_WEIGHTS = (10.0, 2.0, 2.0, 2.0, 2.0, 5.0, 3.0)
+
+def has_question_fts():
+    """True when the questions_fts index exists (SQLite was built with FTS5)."""
+    row = get_conn().execute("SELECT 1 FROM sqlite_master WHERE name = 'questions_fts'").fetchone()
+    return row is not None
+
+def build_fts_query(search_query):
+    """Turns free text into an FTS5 prefix query: every word must match the start of a token."""
+    words = re.findall(r"\w+", search_query)
+    return " ".join(f'"{w}"*' for w in words)
+
+def search_question_ids(search_query, limit=50, offset=0):
+    """Ranked prefix search over question text, options, subject and category. Returns one page of rowids."""
+    try:
+        conn = get_conn()
+        if has_question_fts():
+            match = build_fts_query(search_query)
+            if not match:
+                return []
+            weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+            rows = conn.execute(f"""
+                SELECT rowid FROM questions_fts
+                WHERE questions_fts MATCH ?
+                ORDER BY bm25(questions_fts, {weights})
+                LIMIT ? OFFSET ?
+            """, (match, limit, offset)).fetchall()
+        else:
+            # Fallback without FTS5: unranked substring match
+            like = f"%{search_query}%"
+            where = " OR ".join(f"{c} LIKE ?" for c in FTS_COLUMNS)
+            rows = conn.execute(f"SELECT rowid FROM questions WHERE {where} ORDER BY rowid LIMIT ? OFFSET ?",
+                                (*[like] * len(FTS_COLUMNS), limit, offset)).fetchall()
+        return [r[0] for r in rows]
+    except Exception as e:
+        print(f"Database Error (Search): {e}")
+        return []
+
+def get_managed_rows_by_ids(ids):
+    """Fetches admin rows for the given rowids, keeping the order of ids."""
+    if not ids:
+        return []
+    placeholders = ",".join("?" * len(ids))
+    rows = get_conn().execute(f"SELECT {MANAGED_QUESTION_COLUMNS} FROM questions WHERE rowid IN ({placeholders})",
+                              list(ids)).fetchall()
+    by_id = {row[0]: row for row in rows}
+    return [by_id[i] for i in ids if i in by_id]
+
+def get_managed_questions(search_query="", limit=-1, offset=0):
+    """Fetches questions with their rowid, supporting the live search filter (best matches first)."""
     try:
         conn = get_conn()
         if search_query:
-            # Search across Question text or Subject
-            query = "SELECT rowid, * FROM questions WHERE Question LIKE ? OR Subject LIKE ?"
-            cursor = conn.execute(query, (f"%{search_query}%", f"%{search_query}%"))
+            ids = search_question_ids(search_query, limit, offset)
+            # Batch the IN (...) lookups to stay under SQLite's variable limit
+            rows = []
+            for start in range(0, len(ids), 500):
+                rows.extend(get_managed_rows_by_ids(ids[start:start + 500]))
         else:
-            query = "SELECT rowid, * FROM questions"
-            cursor = conn.execute(query)
-            
-        rows = cursor.fetchall()
-        conn.close()
+            query = f"SELECT {MANAGED_QUESTION_COLUMNS} FROM questions LIMIT ? OFFSET ?"
+            rows = conn.execute(query, (limit, offset)).fetchall()
         return rows
     except Exception as e:
         print(f"Database Error (Search): {e}")
         return []
 
+def get_questions_page(after_rowid=0, limit=50):
+    """Keyset pagination for the admin list: the next `limit` questions after a rowid."""
+    try:
+        query = f"SELECT {MANAGED_QUESTION_COLUMNS} FROM questions WHERE rowid > ? ORDER BY rowid LIMIT ?"
+        return get_conn().execute(query, (after_rowid, limit)).fetchall()
+    except Exception as e:
+        print(f"Database Error (Page): {e}")
+        return []
+
+def get_question_stats(ids):
+    """Item statistics from item_analysis.py for the given rowids: {rowid: (attempts, p_value, discrimination, rate1..rate4)}."""
+    stats = {}
+    try:
+        conn = get_conn()
+        ids = list(ids)
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = conn.execute(f"""
+                SELECT question_id, attempts, p_value, discrimination, option1_rate, option2_rate, option3_rate, option4_rate
+                FROM question_stats WHERE question_id IN ({','.join('?' * len(chunk))})
+            """, chunk).fetchall()
+            stats.update({row[0]: row[1:] for row in rows})
+    except Exception as e:
+        print(f"Database Error (Stats): {e}")
+    return stats
+
+def count_questions():
+    try:
+        return get_conn().execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+    except Exception as e:
+        print(f"Database Error (Count): {e}")
+        return 0
+
+class QuestionPager:
+    """Feeds the admin question list one page at a time.
+    Browsing uses keyset pages on rowid, searching walks the ranked FTS results page by page."""
+
+    def __init__(self, search_query="", page_size=50):
+        self.search_query = search_query.strip()
+        self.page_size = page_size
+        self.last_rowid = 0
+        self.offset = 0
+        self.exhausted = False
+
+    def total(self):
+        """Total row count when it is cheap to know (browsing), otherwise None."""
+        return None if self.search_query else count_questions()
+
+    def next_page(self, limit=None):
+        if self.exhausted:
+            return []
+        limit = limit or self.page_size
+        if self.search_query:
+            ids = search_question_ids(self.search_query, limit, self.offset)
+            self.offset += len(ids)
+            rows = get_managed_rows_by_ids(ids)
+            fetched = len(ids)
+        else:
+            rows = get_questions_page(self.last_rowid, limit)
+            if rows:
+                self.last_rowid = rows[-1][0]
+            fetched = len(rows)
+        if fetched < limit:
+            self.exhausted = True
+        # Item statistics (if item_analysis.py has been run) ride along after the question columns
+        stats = get_question_stats([row[0] for row in rows])
+        return [tuple(row) + stats.get(row[0], ()) for row in rows]
+
 def update_question(q_id, category, subject, question, o1, o2, o3, o4, answer):
     """Updates an existing question in the database using its rowid."""
     try:
-        conn = get_conn()
-        conn.execute("""UPDATE questions SET 
-                        Category=?, Subject=?, Question=?, 
-                        Option1=?, Option2=?, Option3=?, Option4=?, Answer=? 
-                        WHERE rowid=?""", 
-                     (category, subject, question, o1, o2, o3, o4, answer, q_id))
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            conn.execute("""UPDATE questions SET 
+                            Category=?, Subject=?, Question=?, 
+                            Option1=?, Option2=?, Option3=?, Option4=?, Answer=? 
+                            WHERE rowid=?""", 
+                         (category, subject, question, o1, o2, o3, o4, answer, q_id))
         return True
     except Exception as e:
         print(f"Database Error (Update): {e}")
@@ -239,73 +388,144 @@ def get_user_dashboard_data(username):
     try:
         conn = get_conn()
         cursor = conn.cursor()
-        # 1. Use LOWER to ensure we match correctly
+        # 1. Totals kept by the quiz_results triggers (see schema_migrations.py): one primary-key lookup
         cursor.execute("""
-            SELECT COUNT(*), AVG(SCORE_PERCENT) 
-            FROM quiz_results 
-            WHERE LOWER(USER_ID) = LOWER(?)
+            SELECT quiz_count, score_sum / scored 
+            FROM user_stats 
+            WHERE username = ?
         """, (username,))
-        stats = cursor.fetchone()
+        stats = cursor.fetchone() or (0, None)
         
         cursor.execute("""
             SELECT DATE, category_name, SCORE_PERCENT 
             FROM quiz_results 
-            WHERE LOWER(USER_ID) = LOWER(?) 
-            ORDER BY ID DESC LIMIT 5
+            WHERE USER_ID = ? COLLATE NOCASE 
+            ORDER BY DATE DESC, ID DESC LIMIT 5
         """, (username,))
         history = cursor.fetchall()
-        conn.close()
         # Debugging: Check the terminal to see what the DB actually found
         print(f"DEBUG: Found {stats[0]} quizzes for user: {username}")
         return {
             'total_quizzes': stats[0] if stats else 0,
             'avg_score': round(stats[1], 1) if stats and stats[1] else 0,
-            'recent_activity': history
+            'recent_activity': history,
+            'due_reviews': count_due_reviews(username)
         }
     except Exception as e:
         print(f"Database Error: {e}")
-        return {'total_quizzes': 0, 'avg_score': 0, 'recent_activity': []}
+        return {'total_quizzes': 0, 'avg_score': 0, 'recent_activity': [], 'due_reviews': 0}
 
-    
-def save_quiz_results(self, user, score, total, percentage, category, timestamp, quiz_data, answers):
+def get_results_version(username):
+    """Cheap marker that changes whenever this user's results change: (newest result id, user's quiz count)."""
     conn = get_conn()
-    # 1. Insert into quiz_results table
-    main_subject = quiz_data['Subject'].iloc[0] if hasattr(quiz_data, 'iloc') else "General"
-    conn.execute("""
-        INSERT INTO quiz_results (USER_ID, SUBJECT, category_name, SCORE_PERCENT, DATE)
-        VALUES (?, ?, ?, ?, ?)
-    """, (user, main_subject, category, percentage, timestamp))
-    # 2. Keep your Subject Performance logic (This works for the Weakest Subject feature)
-    if hasattr(quiz_data, 'groupby'): 
-        for subj in quiz_data['Subject'].unique():
-            s_df = quiz_data[quiz_data['Subject'] == subj]
-            s_cor = sum(1 for i, q in s_df.iterrows() if str(answers.get(i)) == str(q["Answer"]))
-            s_perc = (s_cor / len(s_df)) * 100
-            
-            conn.execute("""
-                INSERT INTO subject_performance (USERNAME, SUBJECT, CORRECT, TOTAL, TIMESTAMP) 
-                VALUES (?, ?, ?, ?, ?)
-            """, (user, subj, s_cor, len(s_df), timestamp))
-    conn.commit()
-    conn.close()
+    newest = conn.execute("SELECT MAX(id) FROM quiz_results").fetchone()[0]
+    count = conn.execute("SELECT quiz_count FROM user_stats WHERE username = ?", (username,)).fetchone()
+    return (newest or 0, count[0] if count else 0)
 
-def update_subject_performance(username, subject, correct, total):
-    conn = get_conn()
-    # Check if subject already exists for this user
-    query = "SELECT 1 FROM subject_performance WHERE username=? AND subject=?"
-    exists = conn.execute(query, (username, subject)).fetchone()
-    if exists:
-        conn.execute("""
-            UPDATE subject_performance 
-            SET correct = correct + ?, total = total + ? 
-            WHERE username=? AND subject=?
-        """, (correct, total, username, subject))
-    else:
-        conn.execute("""
-            INSERT INTO subject_performance (username, subject, correct, total) 
-            VALUES (?, ?, ?, ?)
-        """, (username, subject, correct, total))
-    conn.commit()
-    conn.close()
+def count_due_reviews(username):
+    """Number of questions due for review now (a range count on the (username, due_at) index)."""
+    now = datetime.datetime.now().strftime(TIME_FORMAT)
+    row = get_conn().execute("SELECT COUNT(*) FROM review_schedule WHERE username = ? AND due_at <= ?",
+                             (username, now)).fetchone()
+    return row[0] if row else 0
+
+def get_due_reviews(username, limit=20):
+    """Question ids of the earliest-due reviews, oldest first."""
+    try:
+        now = datetime.datetime.now().strftime(TIME_FORMAT)
+        rows = get_conn().execute("""
+            SELECT question_id FROM review_schedule
+            WHERE username = ? AND due_at <= ?
+            ORDER BY due_at LIMIT ?
+        """, (username, now, limit)).fetchall()
+        return [r[0] for r in rows]
+    except Exception as e:
+        print(f"Database Error (Reviews): {e}")
+        return []
+
+    
+# Adds a quiz's per-subject counts to the user's running totals (unique key: username, subject)
+UPSERT_SUBJECT_PERFORMANCE = """
+    INSERT INTO subject_performance (username, subject, correct, total, timestamp)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (username, subject) DO UPDATE SET
+        correct = correct + excluded.correct,
+        total = total + excluded.total,
+        timestamp = COALESCE(excluded.timestamp, timestamp)
+"""
 
+# One quiz's answers added to the user's per-question history (used by the Adaptive mode)
+UPSERT_USER_QUESTION_STATS = """
+    INSERT INTO user_question_stats (username, question_id, attempts, wrong, last_seen)
+    VALUES (?, ?, 1, ?, ?)
+    ON CONFLICT (username, question_id) DO UPDATE SET
+        attempts = attempts + 1,
+        wrong = wrong + excluded.wrong,
+        last_seen = excluded.last_seen
+"""
 
+def get_user_question_stats(username):
+    """(question_id, attempts, wrong, last_seen) for every question the user has answered."""
+    try:
+        return get_conn().execute("""
+            SELECT question_id, attempts, wrong, last_seen FROM user_question_stats WHERE username = ?
+        """, (username,)).fetchall()
+    except Exception as e:
+        print(f"Database Error (Question History): {e}")
+        return []
+
+def save_quiz_results(self, user, score, total, percentage, category, timestamp, quiz_data, answers, quiz_score=None,
+                      time_spent=None, session_id=None, replace_session_id=None):
+    """Writes a finished quiz in one transaction: the result row, subject totals and one row per question.
+    When session_id is given the attempts were already written by the attempt log and are only linked
+    to the result. replace_session_id is a session the log wrote only in part; it is deleted, so the
+    attempts written here are the only ones. time_spent is an optional {quiz_data index label: seconds} dict."""
+    # Reuse the score computed in finish_quiz when it is passed in
+    if quiz_score is None and hasattr(quiz_data, 'groupby'):
+        from scoring import QuizScore
+        quiz_score = QuizScore(quiz_data, answers)
+    with transaction() as conn:
+        # 1. Insert into quiz_results table
+        main_subject = quiz_data['Subject'].iloc[0] if hasattr(quiz_data, 'iloc') else "General"
+        cur = conn.execute("""
+            INSERT INTO quiz_results (USER_ID, SUBJECT, category_name, SCORE_PERCENT, DATE)
+            VALUES (?, ?, ?, ?, ?)
+        """, (user, main_subject, category, percentage, timestamp))
+        result_id = cur.lastrowid
+        if replace_session_id is not None:
+            conn.execute("DELETE FROM question_attempts WHERE session_id = ?", (replace_session_id,))
+            conn.execute("DELETE FROM quiz_sessions WHERE id = ?", (replace_session_id,))
+        if session_id is not None:
+            conn.execute("UPDATE quiz_sessions SET result_id = ? WHERE id = ?", (result_id, session_id))
+        if quiz_score is None:
+            return result_id
+        # 2. Subject totals (used by the Weakest Subject feature), one upsert per subject
+        conn.executemany(UPSERT_SUBJECT_PERFORMANCE,
+                         [(user, subj, s_cor, s_total, timestamp) for subj, s_cor, s_total in quiz_score.by_subject])
+        if 'rowid' in quiz_data.columns:
+            # Per-user question history for the Adaptive mode. Only answered questions count: a quiz that
+            # ended early (Sudden Death, timer) must not mark the questions never reached as wrong
+            answered = quiz_score.answered
+            conn.executemany(UPSERT_USER_QUESTION_STATS,
+                             [(user, int(qid), int(not ok), timestamp)
+                              for qid, ok in zip(quiz_data['rowid'].to_numpy()[answered], quiz_score.correct[answered])])
+            # Spaced-repetition due dates, rescheduled for the answered questions in one batch
+            # (unanswered ones would otherwise come back as failed reviews after RELEARN_MINUTES)
+            update_review_schedule(conn, user, quiz_data['rowid'].to_numpy()[answered], quiz_score.correct[answered])
+        # 3. Per-question attempts, when the quiz rows carry their question id and were not logged live.
+        # Like the attempt log, only answered questions get a row, so item statistics do not depend on the save path
+        if session_id is None and 'rowid' in quiz_data.columns:
+            session_id = conn.execute("INSERT INTO quiz_sessions (username, started_at, result_id) VALUES (?, ?, ?)",
+                                      (user, timestamp, result_id)).lastrowid
+            time_spent = time_spent or {}
+            conn.executemany("""
+                INSERT INTO question_attempts (session_id, username, question_id, chosen, is_correct, time_spent, answered_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [(session_id, user, int(qid), str(answers.get(i)), int(ok), time_spent.get(i), timestamp)
+                  for i, qid, ok, done in zip(quiz_data.index, quiz_data['rowid'], quiz_score.correct, quiz_score.answered)
+                  if done])
+    return result_id
+
+def update_subject_performance(username, subject, correct, total):
+    with transaction() as conn:
+        conn.execute(UPSERT_SUBJECT_PERFORMANCE, (username, subject, correct, total, None))
@@ -0,0 +1,155 @@
+"""
+item_analysis.py
+----------------
+Offline job that computes classical item statistics for every question from question_attempts
+and stores them in question_stats (shown on the admin Manage Questions cards).
+
+    python item_analysis.py
+    python item_analysis.py --db prepify.db --chunk-size 200000
+
+Per question:
+  p_value         share of attempts answered correctly (difficulty, higher = easier)
+  discrimination  point-biserial correlation between getting this question right and the rest of
+                  the quiz score (the question itself is left out of the score)
+  optionN_rate    share of attempts that picked Option1..Option4 (distractor frequency)
+
+Only the last answer per question in a quiz counts. The history is streamed in chunks, so memory
+stays bounded by the number of questions and quizzes, not the number of attempts.
+"""
+import argparse
+import sqlite3
+import time
+from datetime import datetime
+
+import numpy as np
+
+from database_manager import DB_NAME
+from schema_migrations import migrate
+
+# The last answer given to each question in each quiz (SQLite takes the bare columns from the MAX(id) row)
+LATEST_ANSWERS = """
+    SELECT session_id, question_id, is_correct, chosen, MAX(id) AS id
+    FROM question_attempts
+    GROUP BY session_id, question_id
+"""
+
+
+def compute_stats(conn, chunk_size=200000):
+    """Returns (question ids, dict of per-question stat arrays)."""
+    qids = np.array([r[0] for r in conn.execute("SELECT rowid FROM questions ORDER BY rowid")], dtype=np.int64)
+    nq = len(qids)
+
+    # Running sums per question: all attempts, and attempts from quizzes with at least one other question
+    n_all = np.zeros(nq)
+    x_all = np.zeros(nq)
+    n, sx, sy, syy, sxy = (np.zeros(nq) for _ in range(5))
+    picks = np.zeros(nq * 5)  # column 0 = unanswered / not one of the options
+
+    def accumulate(block):
+        nonlocal n_all, x_all, picks, n, sx, sy, syy, sxy
+        # block holds whole quizzes only, so each quiz's score is complete
+        _, spos, s_count = np.unique(block[:, 1], return_inverse=True, return_counts=True)
+        x = block[:, 2].astype(np.float64)
+        s_correct = np.bincount(spos, weights=x)
+        known = block[:, 0] >= 0
+        qpos = np.searchsorted(qids, block[:, 0])
+
+        n_all += np.bincount(qpos[known], minlength=nq)
+        x_all += np.bincount(qpos[known], weights=x[known], minlength=nq)
+        picks += np.bincount(qpos[known] * 5 + block[known, 3], minlength=nq * 5)
+
+        # Rest score: share correct among the other questions of the same quiz
+        others = s_count[spos] - 1
+        valid = known & (others > 0)
+        qv, xv = qpos[valid], x[valid]
+        y = (s_correct[spos][valid] - xv) / others[valid]
+        n += np.bincount(qv, minlength=nq)
+        sx += np.bincount(qv, weights=xv, minlength=nq)
+        sy += np.bincount(qv, weights=y, minlength=nq)
+        syy += np.bincount(qv, weights=y * y, minlength=nq)
+        sxy += np.bincount(qv, weights=xv * y, minlength=nq)
+
+    # Rows arrive ordered by quiz, so a chunk's last (maybe unfinished) quiz is carried into the next chunk.
+    # Answers to deleted questions still count towards their quiz's score (question_id -1).
+    cur = conn.execute(f"""
+        SELECT COALESCE(q.rowid, -1), l.session_id, l.is_correct,
+               CASE l.chosen WHEN q.Option1 THEN 1 WHEN q.Option2 THEN 2
+                             WHEN q.Option3 THEN 3 WHEN q.Option4 THEN 4 ELSE 0 END
+        FROM ({LATEST_ANSWERS}) l LEFT JOIN questions q ON q.rowid = l.question_id
+        ORDER BY l.session_id
+    """)
+    carry = np.empty((0, 4), dtype=np.int64)
+    while True:
+        rows = cur.fetchmany(chunk_size)
+        if not rows:
+            break
+        block = np.concatenate([carry, np.array(rows, dtype=np.int64)])
+        cut = np.searchsorted(block[:, 1], block[-1, 1])
+        if cut > 0:
+            accumulate(block[:cut])
+        carry = block[cut:]
+    if len(carry):
+        accumulate(carry)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p_value = np.where(n_all > 0, x_all / n_all, np.nan)
+        # Pearson r between a 0/1 item score and the rest score is the point-biserial correlation
+        mx, my = sx / n, sy / n
+        cov = sxy / n - mx * my
+        var_x = mx - mx * mx
+        var_y = np.clip(syy / n - my * my, 0, None)
+        denom = np.sqrt(var_x * var_y)
+        discrimination = np.where((n >= 2) & (denom > 1e-12), cov / denom, np.nan)
+        rates = picks.reshape(nq, 5)[:, 1:] / n_all[:, None]
+
+    return qids, {
+        "attempts": n_all.astype(np.int64),
+        "p_value": p_value,
+        "discrimination": discrimination,
+        "rates": rates,
+    }
+
+
+def save_stats(conn, qids, stats):
+    def val(v):
+        return None if np.isnan(v) else round(float(v), 4)
+
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    rows = [(int(q), int(stats["attempts"][i]), val(stats["p_value"][i]), val(stats["discrimination"][i]),
+             *(val(r) for r in stats["rates"][i]), now)
+            for i, q in enumerate(qids)]
+    with conn:
+        conn.executemany("""
+            INSERT OR REPLACE INTO question_stats
+            (question_id, attempts, p_value, discrimination, option1_rate, option2_rate, option3_rate, option4_rate, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        # Questions deleted since the last run
+        conn.execute("DELETE FROM question_stats WHERE question_id NOT IN (SELECT rowid FROM questions)")
+    return len(rows)
+
+
+def run(db_path=DB_NAME, chunk_size=200000):
+    conn = sqlite3.connect(db_path)
+    try:
+        migrate(conn)
+        start = time.perf_counter()
+        qids, stats = compute_stats(conn, chunk_size)
+        written = save_stats(conn, qids, stats)
+        elapsed = time.perf_counter() - start
+        print(f"Item analysis: {written} questions, {int(stats['attempts'].sum())} answers, {elapsed:.2f}s")
+        return written
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=DB_NAME, help="database file (default: the app's database)")
+    parser.add_argument("--chunk-size", type=int, default=200000, help="attempt rows read per batch")
+    args = parser.parse_args()
+    run(args.db, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
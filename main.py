@@ -1,65 +1,164 @@
+import importlib
 import tkinter as tk
 from tkinter import messagebox, filedialog
 import customtkinter as ctk
-import pandas as pd
+import numpy as np
 import sqlite3 
 import time
 import traceback
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from datetime import datetime
 # Import app modules
 import database_manager as db
 import auth_manager as auth
-import report_generator as report
+from async_tasks import DebouncedSearch, TaskRunner, get_executor
+from attempt_log import AttemptLog
+from progress_analytics import get_progress_analytics
+from quiz_timer import QuizTimer
+from screen_router import ScreenRouter
 from ui_components import *
+# After the star import: database_manager's "import datetime" would otherwise shadow the class
+from datetime import datetime
+
+# pandas, matplotlib and reportlab are not imported before the welcome screen is up.
+# The modules that need them are imported where they are used, and warmed up in the background.
+WARM_UP_MODULES = ("bcrypt", "scoring", "adaptive_sampler", "report_generator", "matplotlib.backends.backend_tkagg")
 
 
 class QuizApp:
-    def __init__(self, root):
+    def __init__(self, root, warm_up=True):
         self.root = root
         self.root.title("Prepify (Entry Test Past Paper Quiz Application)")
         self.root.geometry("1280x850")
         self.selected_category_val = "MDCAT"  # Default starting value
         self.current_user = None
         self.is_admin = 0 
-        self.quiz_data = pd.DataFrame()
+        self.quiz_data = None
+        self.quiz_score = None
+        self.quiz_session = None
+        self.adaptive = None
+        self.quiz_comp = None
+        self.quiz_records = []
+        # Built screens are kept and swapped instead of rebuilt (see screen_router.py)
+        self.router = ScreenRouter(self.root)
+        # Which results / question bank version the kept dashboard shows
+        self.dashboard_results_version = None
+        self.dashboard_bank_version = None
+        # Zoom of the progress graph in days (None = whole history)
+        self.progress_days = None
         self.current_q = 0
         self.answers = {} 
-        self.timer_running = False
-        self._timer_after_id = None
+        # Monotonic countdown with a single pending callback (see quiz_timer.py)
+        self.timer = QuizTimer(self.root, on_tick=self.on_timer_tick, on_expire=self.on_timer_expired)
         self.in_quiz_mode = False
         self.last_score = 0
         self.last_total = 0
         self.last_perc = 0.0 
         self.root.bind("<Configure>", self.update_wraplength)
+        # Background worker for DB/pandas work, results come back on the Tk thread
+        self.tasks = TaskRunner(self.root)
+        # Staged startup: the welcome screen comes first, the database and question bank load
+        # on a worker thread once it has been drawn (see load_in_background)
+        self.warm_up = warm_up
+        self.startup = None
+        self.attempt_log = None
+        self.question_cache = None
+        self.show_main_welcome()
+        self.root.after_idle(self.start_background_load)
+
+
+    def start_background_load(self):
+        self.startup = self.tasks.submit(
+            self.load_in_background,
+            on_done=self.on_startup_loaded,
+            on_error=lambda e: print(f"Startup Error: {e}"),
+            screen_bound=False
+        )
+
+
+    def load_in_background(self):
+        """Worker thread: everything the welcome screen does not need."""
+        # 1. Schema first, every query after this depends on it
         db.init_db()
+        # 2. The question bank (this is where pandas gets imported)
+        from question_cache import QuestionCache
+        cache = QuestionCache()
+        cache.sync()
+        return cache
+
+
+    def on_startup_loaded(self, cache):
+        if self.question_cache is not None:
+            return
+        # Writes per-question answers on its own thread while a quiz runs
+        self.attempt_log = AttemptLog()
+        self.question_cache = cache
         self.refresh_local_data()
-        self.show_main_welcome()
+        # 3. Optional warm-up, so the first quiz, report or chart does not pay for its imports
+        if self.warm_up:
+            get_executor().submit(warm_up_imports)
+
+
+    def ensure_ready(self):
+        """Waits for the background startup. Usually it finished while the user was typing."""
+        if self.question_cache is not None:
+            return
+        cache = None
+        if self.startup is not None:
+            try:
+                cache = self.startup.future.result()
+            except Exception as e:
+                print(f"Startup Error: {e}")
+        # Not started yet, or it failed: load on this thread instead
+        self.on_startup_loaded(cache or self.load_in_background())
 
 
     def refresh_local_data(self):
-        self.full_df = db.get_questions()
+        # Cheap when nothing changed: only rows edited since the last sync are re-read
+        self.question_cache.sync()
+        # Compact categorical/array-backed bank (see question_store.py), not a raw DataFrame
+        self.question_store = self.question_cache.store
+        # Category/subject lookups for this bank version (rebuilt by the cache only when it changes)
+        self.question_index = self.question_cache.index
 
 
     def clear_screen(self):
-    # This loops through everything inside the window and deletes it
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.clear_widgets()
         # Reset references so we don't try to use 'dead' widgets
         self.dash_comp = None
+        self.quiz_comp = None
+        self.timer.stop()
+        # Drop background loads and searches still running for the screen we just left
+        self.tasks.cancel_screen_tasks()
+        for search in (getattr(self, 'user_search', None), getattr(self, 'question_search', None)):
+            if search:
+                search.cancel()
+
+
+    def clear_widgets(self):
+    # This loops through everything inside the window and deletes it,
+    # except the screens kept by the router: those are only hidden
+        self.router.hide()
+        for widget in self.root.winfo_children():
+            if not self.router.owns(widget):
+                widget.destroy()
+
+
+    def show_loading(self, text="Loading..."):
+        """Clears the window and shows a lightweight placeholder while a screen's data loads."""
+        self.clear_screen()
+        self.loading_comp = LoadingFrame(self.root, text=text)
+        self.loading_comp.pack(expand=True, fill="both")
 
 
     def stop_timer(self):
-        self.timer_running = False
-        if hasattr(self, '_timer_after_id') and self._timer_after_id:
-            try: self.root.after_cancel(self._timer_after_id)
-            except: pass
+        self.timer.stop()
 
     # =========================
     # AUTHENTICATION UI
     # =========================
     def show_main_welcome(self):
+        # Kept screens belong to the user who is logging out
+        self.router.drop()
+        self.progress_days = None
         self.clear_screen()
         self.in_quiz_mode = False
         # This is your ORIGINAL welcome screen code
@@ -90,6 +189,7 @@ class QuizApp:
 
 
     def handle_login(self):
+        self.ensure_ready()
         u, p = self.auth_user.get(), self.auth_pass.get()
         success, is_admin, logged_in_user = auth.handle_login_db(u, p)
         if success:
@@ -106,6 +206,7 @@ class QuizApp:
 
 
     def handle_register(self):
+        self.ensure_ready()
         if auth.handle_register_db(self.auth_user.get(), self.auth_pass.get()):
             messagebox.showinfo("Success", "Account created!"); self.show_auth_screen("login")
         else: messagebox.showerror("Error", "Username exists")
@@ -115,34 +216,72 @@ class QuizApp:
     # =========================
 
     def show_dashboard(self, is_admin=0, user_name="Guest"):
-    # 1. Fetch data using the correct username
-        user_stats = db.get_user_dashboard_data(self.current_user_id)
-        recent_history = db.get_recent_activity(self.current_user_id)
-        self.clear_screen()
         self.in_quiz_mode = False
-        categories = list(self.full_df['Category'].unique())
-        subjects = sorted(self.full_df['Subject'].unique())
+        # View-model key: whose dashboard, and which version of their results
+        key = (self.current_user_id, is_admin)
+        version = db.get_results_version(self.current_user_id)
+        if self.router.get("dashboard", key) is not None:
+            # Kept from an earlier visit: show the same frame straight away
+            self.clear_screen()
+            self.dash_comp = self.router.show("dashboard", None, key=key, refresh=self.update_dashboard_bank)
+            if version == self.dashboard_results_version:
+                self.dash_comp.update_due_reviews(db.count_due_reviews(self.current_user_id))
+            else:
+                # Results were saved or cleared since: patch Quick Stats and Recent Activity only
+                self.tasks.submit(
+                    db.get_user_dashboard_data, self.current_user_id,
+                    on_done=lambda user_stats: self.patch_dashboard(user_stats, version)
+                )
+            return
+    # 1. Fetch data using the correct username (in the background, placeholder meanwhile)
+        self.show_loading("Loading your dashboard...")
+        self.tasks.submit(
+            db.get_user_dashboard_data, self.current_user_id,
+            on_done=lambda user_stats: self.build_dashboard(is_admin, user_name, user_stats, version)
+        )
+
+
+    def patch_dashboard(self, user_stats, version):
+        if self.dash_comp is not None:
+            self.dash_comp.update_stats(user_stats)
+            self.dashboard_results_version = version
+
+
+    def build_dashboard(self, is_admin, user_name, user_stats, version=None):
+        self.clear_screen()
+        categories = self.question_index.categories
+        subjects = self.question_index.subjects
         cmds = {
             'admin': self.show_admin_panel,
             'progress': self.show_progress_view,
             'weak': self.show_weakest_subject_view,
             'logout': self.show_main_welcome,
-            'dash_cmd': self.show_dashboard, 
-            'start': self.start_quiz
+            'dash_cmd': self.on_history_cleared, 
+            'start': self.start_quiz,
+            'review': self.start_review_quiz
         }
-    # 2. Building the Frame
-        self.dash_comp = DashboardFrame(
+    # 2. Building the Frame (kept by the router for the next visit)
+        self.dash_comp = self.router.show("dashboard", lambda: DashboardFrame(
             master=self.root,
             is_admin=is_admin,
             user_name=user_name, 
             categories=categories,
-            subjects_df=self.full_df, 
+            subjects_by_category=self.question_index.subjects_by_category, 
             subjects=subjects,
             commands=cmds,
             stats_data=user_stats, 
             win_width=self.root.winfo_width()
-        )
-        self.dash_comp.pack(fill="both", expand=True)
+        ), key=(self.current_user_id, is_admin), refresh=lambda view: view.update_stats(user_stats))
+        self.dashboard_results_version = version
+        self.dashboard_bank_version = self.question_cache.version
+
+
+    def update_dashboard_bank(self, view):
+        """Refreshes the category/subject lists of a reused dashboard if the question bank changed."""
+        if self.dashboard_bank_version != self.question_cache.version:
+            view.update_categories(self.question_index.categories, self.question_index.subjects_by_category,
+                                   self.question_index.subjects)
+            self.dashboard_bank_version = self.question_cache.version
 
 
     def update_app_category(self, choice):
@@ -168,9 +307,9 @@ class QuizApp:
         if not count.isdigit(): 
             messagebox.showerror("Invalid Input", "Please enter a valid number for the question count.")
             return
-    # 4. Filter data based on selections
-        filtered = self.full_df[(self.full_df['Category'] == cat) & (self.full_df['Subject'].isin(subs))]
-        available_count = len(filtered)
+    # 4. Filter data based on selections (precomputed row positions, no scan of the bank)
+        pool = self.question_index.pool(cat, subs)
+        available_count = len(pool)
     # 5. CHECK FOR INSUFFICIENT QUESTIONS
         if int(count) > available_count:
             msg = f"Only {available_count} questions are available for these selections.\n\nStart with all {available_count} questions?"
@@ -187,56 +326,110 @@ class QuizApp:
         else:
             multiplier = 60  # Your original 60 seconds per question
 
-        self.quiz_data = filtered.sample(n=final_count).reset_index(drop=True)
-        self.time_left = len(self.quiz_data) * multiplier
+        if self.quiz_mode == "Adaptive":
+            # Weighted towards questions this user misses or has not seen lately
+            chosen = self.get_adaptive_sampler().sample(self.question_store, pool, final_count)
+        else:
+            chosen = np.random.choice(pool, size=final_count, replace=False)
+        self.begin_quiz(chosen, multiplier)
+
+
+    def start_review_quiz(self):
+        """Quiz made of the questions due for spaced-repetition review, earliest due first."""
+        count = self.dash_comp.num_ent.get()
+        limit = int(count) if count.isdigit() and int(count) > 0 else 20
+        due_ids = np.array(db.get_due_reviews(self.current_user, limit), dtype=np.int64)
+        # Map question ids to bank positions (questions deleted since are skipped)
+        ids = self.question_store.ids
+        pos = np.searchsorted(ids, due_ids).clip(0, max(len(ids) - 1, 0))
+        chosen = pos[ids[pos] == due_ids] if len(ids) else pos[:0]
+        if not len(chosen):
+            messagebox.showinfo("Review", "Nothing is due for review right now.")
+            return
+        self.quiz_mode = "Review"
+        self.begin_quiz(chosen, 60)
+
+
+    def begin_quiz(self, chosen, multiplier):
+        # Only the sampled questions are materialized as a DataFrame for the quiz screens;
+        # their rowid stays as a column so each answer can be logged against its question
+        self.quiz_data = self.question_store.take(chosen).reset_index()
+        # Every question's display data as plain dicts, so Next/Back never touch pandas
+        self.quiz_records = self.quiz_data.to_dict("records")
+        # The category is read while the dashboard is still current; the save uses it
+        self.quiz_category = self.dash_comp.cat_cb.get() if self.dash_comp is not None else "MDCAT"
+        # Leave the dashboard like any other screen: it stays kept (hidden) for after the quiz
+        self.clear_screen()
         self.current_q, self.answers = 0, {}
-        self.timer_running = True
+        # Answers are logged per question as they are given (see attempt_log.py)
+        self.quiz_session = self.attempt_log.start_session(self.current_user)
+        self.logged_answers, self.time_spent = {}, {}
         self.start_time = time.time()
+        # Sprint: every question gets its own budget; other modes share one budget for the quiz
+        if self.quiz_mode == "Sprint":
+            self.timer.start(per_question_seconds=multiplier)
+        else:
+            self.timer.start(total_seconds=len(self.quiz_data) * multiplier)
         self.show_quiz_ui()
-        self.update_timer()
 
 
-    def update_timer(self):
-        if self.timer_running and self.time_left > 0:
-            mins, secs = divmod(self.time_left, 60)
-            # This line shows the timer label
-            self.timer_label.configure(text=f"Time Remaining: {mins:02d}:{secs:02d}")
-            self.time_left -= 1
-            self.root.after(1000, self.update_timer)
-        elif self.time_left <= 0:
+    def on_timer_tick(self, seconds_left):
+        mins, secs = divmod(seconds_left, 60)
+        # This line shows the timer label
+        self.timer_label.configure(text=f"Time Remaining: {mins:02d}:{secs:02d}")
+
+
+    def on_timer_expired(self, kind):
+        if kind == "question":
+            # Sprint: out of time for this question, keep whatever is selected and move on
+            self.handle_next()
+        else:
             self.finish_quiz()
 
 
     def show_quiz_ui(self):
-    # Clear screens
-        for widget in self.root.winfo_children(): 
-            if widget != getattr(self, 'sidebar', None): widget.destroy()
-    # Initialize current question data
-        q_data = self.quiz_data.iloc[self.current_q]
+    # The quiz screen is built once per quiz; Next/Back only update it
+        if self.quiz_comp is None or not self.quiz_comp.winfo_exists():
+            # Kept screens are only hidden; the running quiz timer is left alone
+            self.clear_widgets()
+            self.quiz_comp = QuizFrame(
+                master=self.root,
+                total_q=len(self.quiz_data),
+                next_cmd=self.handle_next,
+                prev_cmd=self.prev_q
+            )
+            self.quiz_comp.pack(side="right", fill="both", expand=True)
+            self.timer_label = self.quiz_comp.timer_label
+            self.opt_var = self.quiz_comp.opt_var
+    # Question data comes from the records prepared in begin_quiz
         saved_ans = self.answers.get(self.current_q, "None")
-    # Initialize the Quiz Component
-        self.quiz_comp = QuizFrame(
-            master=self.root,
-            current_q=self.current_q,
-            total_q=len(self.quiz_data),
-            question_data=q_data,
-            saved_answer=saved_ans,
-            next_cmd=self.handle_next,
-            prev_cmd=self.prev_q
-        )
-        self.quiz_comp.pack(side="right", fill="both", expand=True)
-        self.timer_label = self.quiz_comp.timer_label
-        self.opt_var = self.quiz_comp.opt_var
+        self.quiz_comp.show_question(self.current_q, self.quiz_records[self.current_q], saved_ans)
+        self.timer.start_question()
+
+
+    def record_answer(self, position, selected_option):
+        """Stores the answer and queues it for the attempt log (no database work on this thread)."""
+        self.answers[position] = selected_option
+        spent = self.timer.question_elapsed()
+        self.time_spent[position] = self.time_spent.get(position, 0.0) + spent
+        from scoring import is_answered, is_correct_answer
+        if not is_answered(selected_option) or self.logged_answers.get(position) == selected_option:
+            return
+        self.logged_answers[position] = selected_option
+        q = self.quiz_records[position]
+        self.attempt_log.record(self.quiz_session, q['rowid'], selected_option,
+                                is_correct_answer(selected_option, q['Answer']), round(spent, 2))
 
 
     def handle_next(self):
     # Get user selection from radio buttons
         selected_option = self.opt_var.get()
-        self.answers[self.current_q] = selected_option
+        self.record_answer(self.current_q, selected_option)
     # SUDDEN DEATH MODE CHECK
         if hasattr(self, 'quiz_mode') and self.quiz_mode == "Death":
-            correct_ans = str(self.quiz_data.iloc[self.current_q]['Answer'])
-            if selected_option != correct_ans:
+            correct_ans = self.quiz_records[self.current_q]['Answer']
+            from scoring import is_correct_answer
+            if not is_correct_answer(selected_option, correct_ans):
                 messagebox.showinfo("ELIMINATED", "Incorrect! In Sudden Death mode, one mistake ends the quiz.")
                 self.finish_quiz()
                 return
@@ -248,30 +441,33 @@ class QuizApp:
             self.finish_quiz()
 
 
-    def prev_q(self): self.answers[self.current_q] = self.opt_var.get(); self.current_q -= 1; self.show_quiz_ui()
+    def prev_q(self): self.record_answer(self.current_q, self.opt_var.get()); self.current_q -= 1; self.show_quiz_ui()
 
 
     def finish_quiz(self):
         self.stop_timer() 
         try:
-            ts = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
-        # 1. Calculate the stats
-            f_score = sum(1 for i, q in self.quiz_data.iterrows() 
-                            if str(self.answers.get(i)) == str(q["Answer"]))
-            f_total = len(self.quiz_data)
-            f_perc = (f_score / f_total) * 100
+            ts = datetime.now().strftime("%Y-%m-%d %H:%M")
+        # 1. Calculate the stats (once, shared by the save, review screen and PDF)
+            from scoring import QuizScore
+            self.quiz_score = QuizScore(self.quiz_data, self.answers)
+            f_score = self.quiz_score.score
+            f_total = self.quiz_score.total
+            f_perc = self.quiz_score.percentage
         # 2. Update class variables for safety
             self.last_score = f_score
             self.last_total = f_total
             self.last_perc = f_perc
        # 3. Save to database (Confirmed working for spceific username!)
-            try:
-                final_cat = self.dash_comp.cat_cb.get() 
-            except:
-        # Fallback if the dashboard isn't loaded
-                final_cat = "MDCAT"
-            db.save_quiz_results(
-                db,
+            final_cat = self.quiz_category
+        # Review quizzes can start without a category picked
+            if final_cat == "Select Category":
+                final_cat = str(self.quiz_data['Category'].iloc[0])
+            self.show_loading("Saving your results...")
+        # The save runs on the worker thread and is not cancelled by navigation
+            self.tasks.submit(
+                self.save_logged_results,
+                self.quiz_session,
                 self.current_user,                        # 1. user
                 f_score,                                  # 2. score
                 f_total,                                  # 3. total
@@ -279,25 +475,61 @@ class QuizApp:
                 final_cat,                                # 5. category          
                 ts,                                       # 6. timestamp
                 self.quiz_data,                           # 7. quiz_data
-                self.answers                              # 8. answers 
+                dict(self.answers),                       # 8. answers 
+                self.quiz_score,                          # 9. precomputed score
+                on_done=lambda _: self.on_results_saved(f_score, f_total, f_perc),
+                on_error=self.on_save_failed,
+                screen_bound=False
             )
-            print(f"DEBUG: Successfully saved. Passing {f_score}, {f_total}, {f_perc} to results.")
-        # 4. THE KEY FIX: Pass the 3 missing arguments into the method
-            self.show_results(f_score, f_total, f_perc)
         except Exception as e:
-            print(f"CRITICAL ERROR in finish_quiz: {e}")
-            traceback.print_exc()
-            # Fallback to dashboard if results page fails to load
-            self.show_dashboard(self.is_admin, self.current_user)
+            self.on_save_failed(e)
+
+
+    def save_logged_results(self, session, *args):
+        """Worker thread: waits for the attempt log to catch up, then saves the result linked to its session."""
+        if not self.attempt_log.flush(timeout=5.0):
+            print("Attempt log is behind, saving the result with its own attempt rows")
+            # The log writes nothing more of this session; what it already wrote is replaced by the save
+            stale_id = self.attempt_log.discard(session)
+            return db.save_quiz_results(db, *args, dict(self.time_spent), replace_session_id=stale_id)
+        return db.save_quiz_results(db, *args, dict(self.time_spent), session_id=session.id)
+
+
+    def get_adaptive_sampler(self):
+        """The current user's question history, loaded on first use and then updated in memory."""
+        if self.adaptive is None or self.adaptive.username != self.current_user:
+            from adaptive_sampler import AdaptiveSampler
+            self.adaptive = AdaptiveSampler(self.current_user)
+        return self.adaptive
+
+
+    def on_results_saved(self, f_score, f_total, f_perc):
+        # Keep the Adaptive weights current without re-reading the history (answered questions only, like the save)
+        if self.adaptive is not None and self.adaptive.username == self.current_user:
+            answered = self.quiz_score.answered
+            self.adaptive.record(self.quiz_data['rowid'].to_numpy()[answered], self.quiz_score.correct[answered])
+        self.show_results(f_score, f_total, f_perc)
+
+
+    def on_history_cleared(self, is_admin, user_name):
+        self.adaptive = None
+        self.show_dashboard(is_admin, user_name)
+
+
+    def on_save_failed(self, e):
+        print(f"CRITICAL ERROR in finish_quiz: {e}")
+        traceback.print_exception(e)
+        # Fallback to dashboard if results page fails to load
+        self.show_dashboard(self.is_admin, self.current_user)
 
 
     def show_results(self, final_score, total_q, perc):
         """Handles only the UI display of results."""
+        import report_generator as report
         self.clear_screen()
-    # 1. Refresh the local data so the app knows about the quiz we just finished
-        self.refresh_local_data() 
-
-        self.results_comp = ResultsFrame(
+    # Quizzes never change questions, so the question bank is not reloaded here
+    # One kept frame for every finished quiz: only the score and the pie are updated
+        self.results_comp = self.router.show("results", lambda: ResultsFrame(
             master=self.root,
             last_score=self.last_score,
             last_total=self.last_total,
@@ -305,12 +537,12 @@ class QuizApp:
             review_cmd=lambda: self.show_review(),
         # 2. Refresh before going to dashboard
             dash_cmd=lambda: self.reload_dashboard_with_data()
-        )
-        self.results_comp.pack(fill="both", expand=True)
+        ), key=self.current_user, refresh=lambda comp: comp.show_score(self.last_score, self.last_total))
 
 
     def reload_dashboard_with_data(self):
         """Helper to ensure data is fresh before showing the dashboard."""
+        # Only a version check unless an admin changed questions in the meantime
         self.refresh_local_data()
         self.show_dashboard(self.is_admin, self.current_user)
 
@@ -322,11 +554,13 @@ class QuizApp:
 
 
     def show_review(self):
+        import report_generator as report
         self.clear_screen()
         self.review_page = ReviewFrame(
             master=self.root,
             quiz_data=self.quiz_data,
             answers=self.answers,
+            quiz_score=self.quiz_score,
             back_cmd=self.back_to_results,
             save_cmd=lambda: report.save_quiz_pdf(
                 None,                           # ignored_path
@@ -336,7 +570,8 @@ class QuizApp:
                 self.last_total,                # total
                 self.start_time,                # start_time
                 self.quiz_data,                 # quiz_data
-                self.answers                    # answers
+                self.answers,                   # answers
+                self.quiz_score                 # quiz_score
             )
         )
         self.review_page.pack(fill="both", expand=True)
@@ -344,17 +579,23 @@ class QuizApp:
 
     def save_pdf(self):
         # We pass None for the path since the logic finds 'Downloads' automatically
+        import report_generator as report
         report.save_quiz_pdf(None, self.current_user, self.cat_cb.get(), 
                              self.last_score, self.last_total, 
-                             self.start_time, self.quiz_data, self.answers)
+                             self.start_time, self.quiz_data, self.answers, self.quiz_score)
         
     # =========================
     # ADMIN & ANALYTICS
     # =========================
     def show_admin_panel(self):
         self.clear_screen()
-    # 1. Setup the scrollable container
-        scroll = ctk.CTkScrollableFrame(self.root, fg_color="transparent")
+        self.router.show("admin", self.build_admin_panel, key=self.current_user)
+
+
+    def build_admin_panel(self):
+    # 1. Setup the scrollable container (inside a plain frame, which is what the router keeps and swaps)
+        page = ctk.CTkFrame(self.root, fg_color="transparent")
+        scroll = ctk.CTkScrollableFrame(page, fg_color="transparent")
         scroll.pack(expand=True, fill="both")
     # 2. Map administrative commands
         admin_cmds = {
@@ -371,70 +612,92 @@ class QuizApp:
             commands=admin_cmds
         )
         self.admin_comp.pack(expand=True, pady=40, padx=20)
+        return page
 
 
     def show_user_management(self, search_query=""):
         self.clear_screen()
-    # 1. Fetch data logic
-        users = db.get_users_list(self.current_user, search_query)
-    # 2. Map commands
+        # A kept screen just re-runs its current search, so edits made meanwhile show up
+        self.user_manage_comp = self.router.show(
+            "users", lambda: self.build_user_management(search_query), key=self.current_user,
+            refresh=lambda comp: self.user_search.submit(comp.search_var.get(), immediate=True)
+        )
+
+
+    def build_user_management(self, search_query):
+    # 1. Map commands (search runs in the background, debounced while typing)
         user_cmds = {
             'back': self.show_admin_panel,
-            'search': self.show_user_management,
+            'search': lambda q, now=False: self.user_search.submit(q, immediate=now),
             'add_admin': self.add_new_admin_dialog,
             'delete': self.delete_user,
             'reset': self.reset_user_password
         }
-    # 3. Initialize Component
+    # 2. Initialize Component
         self.user_manage_comp = UserManagementFrame(
             master=self.root,
             search_query=search_query,
-            users_list=users,
+            users_list=[],
             commands=user_cmds
         )
-        self.user_manage_comp.pack(expand=True, fill="both")
+    # 3. Fetch data logic on a worker thread, the list fills in when it arrives
+        self.user_search = DebouncedSearch(
+            self.tasks,
+            search_fn=lambda q, user=self.current_user: db.get_users_list(user, q),
+            on_results=self.user_manage_comp.show_users
+        )
+        self.user_search.submit(search_query, immediate=True)
+        return self.user_manage_comp
 
 
     def show_manage_questions_page(self):
         self.clear_screen()
+        self.manage_comp = self.router.show(
+            "manage", self.build_manage_questions_page, key=self.current_user,
+            refresh=lambda comp: self.refresh_manage_list(comp.search_var.get(), immediate=True)
+        )
+
+
+    def build_manage_questions_page(self):
     # Initialize the Manage Questions Component
     # We pass refresh_manage_list so the search bar can trigger it
         self.manage_comp = ManageQuestionsFrame(
             master=self.root,
             back_cmd=self.show_admin_panel,
-            refresh_cmd=self.refresh_manage_list
+            refresh_cmd=self.refresh_manage_list,
+            edit_cmd=self.show_edit_question_page,
+            delete_cmd=self.delete_logic
+        )
+    # Searches run on a worker thread once typing pauses, stale results are dropped
+        self.question_search = DebouncedSearch(
+            self.tasks,
+            search_fn=self.load_manage_page,
+            on_results=self.show_manage_page
         )
-        self.manage_comp.pack(fill="both", expand=True)
     # Initial load of the question list
-        self.refresh_manage_list(self.manage_comp.container, "")
+        self.refresh_manage_list("", immediate=True)
+        return self.manage_comp
 
 
-    def refresh_manage_list(self, container=None, search_query=""):
-        # 1. Use the provided container or the default one
-        target_container = container if container else self.q_cont
-        
-        # 2. Safety Check: Stop if the UI element doesn't exist
-        if not target_container or not target_container.winfo_exists():
-            return
+    def refresh_manage_list(self, search_query="", immediate=False):
+        self.question_search.submit(search_query, immediate=immediate)
 
-        # 3. Clear ONLY the cards inside the container (DO NOT use self.clear_screen())
-        for widget in target_container.winfo_children():
-            widget.destroy()
 
-        # 4. Get data (using the search-enabled database function)
-        rows = db.get_managed_questions(search_query) 
-        
-        # 5. Show a message if no questions exist
-        if not rows:
-            ctk.CTkLabel(target_container, text="No questions found.").pack(pady=20)
-            return
+    def load_manage_page(self, search_query):
+        """Runs on a worker thread: builds the pager and fetches its first page."""
+        pager = db.QuestionPager(search_query)
+        total = pager.total()
+        return pager, pager.next_page(), total
 
-        # 6. Build the UI cards
-        for row in rows:
-            if not target_container.winfo_exists():
-                break
-            # This uses the fancy blue-bordered card we fixed earlier
-            RefreshableQuestionCard.create_question_card(self, target_container, row)
+
+    def show_manage_page(self, result):
+        # 1. Safety Check: Stop if the UI element doesn't exist
+        target_container = getattr(self, 'manage_comp', None) and self.manage_comp.container
+        if not target_container or not target_container.winfo_exists():
+            return
+        # 2. Point the virtual list at the new pager, it draws only the rows in view
+        pager, rows, total = result
+        target_container.set_source(pager, rows, total)
 
             
     def show_edit_question_page(self, q_data):
@@ -545,31 +808,48 @@ class QuizApp:
 
 
     def show_progress_view(self):
-        self.clear_screen() # This properly removes the Dashboard
-        try:
-            df = db.get_progress_data(self.current_user_id)
-        except:
-            df = None 
-        self.progress_comp = ProgressFrame(
+        self.show_loading("Loading your progress...") # This properly removes the Dashboard
+        self.tasks.submit(get_progress_analytics, self.current_user_id, self.progress_days,
+                          on_done=self.build_progress_view,
+                          on_error=lambda e: self.build_progress_view(None))
+
+
+    def build_progress_view(self, progress):
+        self.clear_screen()
+        self.progress_comp = self.router.show("progress", lambda: ProgressFrame(
             master=self.root,
-            progress_df=df,
+            progress=progress,
             # FIX: Added lambda here to prevent auto-executing on load
-            back_cmd=lambda: self.show_dashboard(self.is_admin, self.current_user_id)
-        )
-        self.progress_comp.pack(expand=True, fill="both", padx=30)
+            back_cmd=lambda: self.show_dashboard(self.is_admin, self.current_user_id),
+            range_cmd=self.set_progress_range,
+            days=self.progress_days
+        ), key=self.current_user_id, refresh=lambda comp: comp.show_progress(progress), expand=True, fill="both", padx=30)
+
+
+    def set_progress_range(self, days):
+        """Zooms the progress graph; the kept screen is patched when the new range has loaded."""
+        self.progress_days = days
+
+        def apply(progress):
+            # Ignore a range the user has already clicked away from
+            if days == self.progress_days and self.router.current == "progress":
+                self.progress_comp.show_progress(progress)
+
+        self.tasks.submit(get_progress_analytics, self.current_user_id, days, on_done=apply)
 
 
     def show_weakest_subject_view(self):
-        self.clear_screen()
-        # Logic: Database Fetch
-        try:
-            # CHANGE self.current_user TO self.current_user_id
-            # This matches the variable set during login
-            weak = db.get_weakest_subject_data(self.current_user_id) 
-        except Exception as e:
-            print(f"Debug: Database fetch failed: {e}")
-            weak = None
+        self.show_loading("Finding your weakest subject...")
+        # Logic: Database Fetch (worker thread)
+        # This matches the variable set during login
+        self.tasks.submit(db.get_weakest_subject_data, self.current_user_id,
+                          on_done=self.build_weakest_subject_view,
+                          on_error=lambda e: (print(f"Debug: Database fetch failed: {e}"),
+                                              self.build_weakest_subject_view(None)))
 
+
+    def build_weakest_subject_view(self, weak):
+        self.clear_screen()
         # Initialize Component
         self.weak_comp = WeakSubjectFrame(
             master=self.root,
@@ -597,10 +877,22 @@ class QuizApp:
     def on_closing(self):
         """Cleanly destroys the window and cancels background tasks"""
         # Stops any background 'after' events
+        if self.attempt_log is not None:
+            self.attempt_log.close()
+        db.close_db()
         self.root.quit()
         self.root.destroy()
 
 
+def warm_up_imports():
+    """Worker thread: imports the heavy modules ahead of their first use."""
+    for name in WARM_UP_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"Warm-up Error ({name}): {e}")
+
+
 if __name__ == "__main__":
     root = ctk.CTk(); app = QuizApp(root)
     app.root.protocol("WM_DELETE_WINDOW", app.on_closing)
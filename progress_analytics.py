@@ -0,0 +1,101 @@
+"""
+progress_analytics.py
+---------------------
+Data for the Progress screen. The full quiz history of a student can run to thousands of quizzes,
+so the graph never receives it row by row:
+
+  * the series is downsampled to at most MAX_POINTS points with LTTB (Largest-Triangle-Three-Buckets),
+    which keeps the peaks and dips a plain stride would skip
+  * each of MAX_POINTS buckets gets the min/max score, drawn as a band behind the line
+  * rolling averages come from SQL window functions (database_manager.get_progress_series)
+  * trend slopes are least-squares fits over the selected range
+
+Whatever range is shown (a month or several years), the chart draws the same number of points.
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+
+import database_manager as db
+
+# Zoom levels of the Progress screen: label -> days back from today (None = whole history)
+RANGES = {"1M": 30, "3M": 91, "6M": 182, "1Y": 365, "All": None}
+MAX_POINTS = 150
+ROLLING_WINDOW = 5
+
+
+def lttb(x, y, n_out):
+    """Indices of the n_out points that best keep the shape of (x, y). The first and last point are always kept."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # 1. n_out - 2 buckets between the first and the last point
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    # 2. Mean of every bucket: the third corner of the triangle when choosing from the bucket before it
+    avg_x = np.append(np.add.reduceat(x[:n - 1], edges[:-1]) / sizes, x[-1])
+    avg_y = np.append(np.add.reduceat(y[:n - 1], edges[:-1]) / sizes, y[-1])
+    # 3. From each bucket keep the point spanning the largest triangle with the previous pick and the next mean
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - avg_x[i + 1]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[i + 1] - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def bucket_stats(x, y, n_out):
+    """(centre x, min, mean, max) of y over at most n_out equal-count buckets."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    starts = np.unique(np.linspace(0, len(y), min(n_out, len(y)) + 1).astype(np.int64)[:-1])
+    sizes = np.diff(np.append(starts, len(y)))
+    return (np.add.reduceat(x, starts) / sizes,
+            np.minimum.reduceat(y, starts),
+            np.add.reduceat(y, starts) / sizes,
+            np.maximum.reduceat(y, starts))
+
+
+def trend_slope(x, y):
+    """Least-squares slope of y over x, or None with fewer than two distinct x values."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(x) < 2:
+        return None
+    xc = x - x.mean()
+    denom = float(np.dot(xc, xc))
+    if denom == 0:
+        return None
+    return float(np.dot(xc, y - y.mean())) / denom
+
+
+def summarize(series, points=MAX_POINTS):
+    """Downsampled series, min/max band and trends for one range of get_progress_series() rows."""
+    import pandas as pd
+    if series is None or series.empty:
+        return {"count": 0, "average": None, "slope_per_quiz": None, "slope_per_week": None,
+                "series": pd.DataFrame(), "band": pd.DataFrame()}
+    x = series["quiz_no"].to_numpy(dtype=float)
+    y = series["percentage"].to_numpy(dtype=float)
+    centre, low, _, high = bucket_stats(x, y, points)
+    return {
+        "count": len(series),
+        "average": float(y.mean()),
+        "slope_per_quiz": trend_slope(x, y),
+        "slope_per_week": trend_slope(series["day"].to_numpy(dtype=float) / 7.0, y),
+        "series": series.iloc[lttb(x, y, points)].reset_index(drop=True),
+        "band": pd.DataFrame({"quiz_no": centre, "low": low, "high": high}),
+    }
+
+
+def get_progress_analytics(username, days=None, points=MAX_POINTS, window=ROLLING_WINDOW):
+    """The Progress screen's data for the last `days` days (None = whole history)."""
+    since = None if days is None else (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d %H:%M")
+    summary = summarize(db.get_progress_series(username, since, window), points)
+    summary["days"] = days
+    return summary
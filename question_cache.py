@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+import database_manager as db
+import question_snapshot
+from async_tasks import get_executor
+from question_store import QuestionStore, QuestionTextCache
+
+# Banks larger than this load lazily: only ids and metadata stay resident
+LAZY_THRESHOLD = 20000
+
+
+class QuestionIndex:
+    """Lookup tables for one version of the question bank, built once per sync.
+    Maps (Category, Subject) to the row positions of those questions, so picking a quiz pool
+    joins a few small arrays instead of scanning the whole bank."""
+
+    def __init__(self, store):
+        self.positions = {}
+        if not store.empty:
+            # Sort positions by the combined (category, subject) code, then cut at each code change
+            cat_codes = store.category.codes.astype(np.int64)
+            sub_codes = store.subject.codes.astype(np.int64)
+            combined = cat_codes * len(store.subject.categories) + sub_codes
+            order = np.argsort(combined, kind="stable")
+            starts = np.flatnonzero(np.r_[True, np.diff(combined[order]) != 0])
+            for pos in np.split(order, starts[1:]):
+                key = (store.category.categories[cat_codes[pos[0]]], store.subject.categories[sub_codes[pos[0]]])
+                self.positions[key] = pos
+        self.counts = {key: len(pos) for key, pos in self.positions.items()}
+        self.categories = sorted({cat for cat, _ in self.positions})
+        self.subjects_by_category = {cat: [] for cat in self.categories}
+        for cat, sub in self.positions:
+            self.subjects_by_category[cat].append(sub)
+        self.subjects = sorted({sub for _, sub in self.positions})
+
+    def pool(self, category, subjects):
+        """Row positions of every question in the category for the chosen subjects."""
+        parts = [self.positions[(category, s)] for s in subjects if (category, s) in self.positions]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def count(self, category, subjects):
+        return sum(self.counts.get((category, s), 0) for s in subjects)
+
+
+class QuestionCache:
+    """In-memory copy of the questions table, held as a compact QuestionStore.
+    sync() compares the bank's data version and only re-reads the rows that changed since the last sync.
+    lazy=True keeps only rowid/Category/Subject resident and fetches question text per quiz;
+    lazy=None picks it automatically once the bank has more than LAZY_THRESHOLD questions.
+    With snapshots=True the first sync memory-maps the on-disk snapshot (see question_snapshot.py)
+    instead of reading the table, and the snapshot is rewritten in the background after changes."""
+
+    def __init__(self, lazy=None, text_cache_size=2000, snapshots=True):
+        self.lazy = lazy
+        self.text_cache = QuestionTextCache(db.get_questions, capacity=text_cache_size)
+        self.store = QuestionStore.from_frame(pd.DataFrame())
+        self.index = QuestionIndex(self.store)
+        self.version = None
+        self.snapshot_dir = question_snapshot.snapshot_dir(db.DB_NAME) if snapshots else None
+
+    def _want_lazy(self, count):
+        return self.lazy if self.lazy is not None else count > LAZY_THRESHOLD
+
+    def _load_all(self):
+        lazy = self._want_lazy(db.count_questions())
+        if lazy:
+            self.text_cache.clear()
+            return QuestionStore.from_meta(db.get_question_meta(), self.text_cache)
+        return QuestionStore.from_frame(db.get_questions())
+
+    def _load_snapshot(self, version, db_id):
+        """(snapshot version, store) from the newest usable snapshot, or None."""
+        latest = question_snapshot.latest_snapshot(self.snapshot_dir) if self.snapshot_dir else None
+        # A snapshot newer than the database belongs to some other copy of it
+        if latest is None or latest[0] > version:
+            return None
+        # An older one is only usable if the change log still covers everything since it was taken
+        if latest[0] < version and db.get_changed_question_ids(latest[0]) is None:
+            return None
+        loaded = question_snapshot.load_snapshot(latest[1], self.text_cache, db_id)
+        if loaded is None:
+            return None
+        count = db.count_questions()
+        if loaded[1].lazy != self._want_lazy(count) or (loaded[0] == version and len(loaded[1]) != count):
+            return None
+        return loaded
+
+    def _save_snapshot(self, store, version, db_id):
+        try:
+            question_snapshot.save_snapshot(store, version, self.snapshot_dir, db_id)
+        except Exception as e:
+            print(f"Snapshot Error: {e}")
+
+    def sync(self):
+        """Brings the cache up to date. Returns True if anything changed."""
+        # Read the version first: a change racing with the load is simply applied again next time
+        version = db.get_questions_version()
+        if self.version is not None and version == self.version:
+            return False
+
+        if self.version is None:
+            # First load: start from the snapshot and catch up on anything changed since it was written
+            loaded = self._load_snapshot(version, db.get_database_id())
+            if loaded is not None:
+                self.version, self.store = loaded
+                if self.version == version:
+                    self.index = QuestionIndex(self.store)
+                    return True
+        changed_ids = None if self.version is None else db.get_changed_question_ids(self.version)
+        if changed_ids is None:
+            # First load, or the change log was pruned past our version
+            self.store = self._load_all()
+        elif changed_ids:
+            # Drop every changed row, then add back the ones that still exist (edited or inserted)
+            fresh = db.get_question_meta(changed_ids) if self.store.lazy else db.get_questions(changed_ids)
+            self.store = self.store.apply_changes(changed_ids, fresh)
+            db.prune_question_changes()
+        self.index = QuestionIndex(self.store)
+        self.version = version
+        if self.snapshot_dir:
+            # Stores are never modified in place, so the worker can write this one while the app goes on
+            get_executor().submit(self._save_snapshot, self.store, version, db.get_database_id())
+        return True
@@ -0,0 +1,150 @@
+"""
+question_snapshot.py
+--------------------
+On-disk copy of the compact QuestionStore, so startup does not parse the questions table again.
+One file per data version of the bank (see database_manager.get_questions_version):
+
+    prepify_snapshots/questions-v<version>.snap
+
+A file is a small JSON header followed by the store's arrays, each 64-byte aligned. Loading
+memory-maps the file: the arrays (ids, codes, text buffers) are views into it and pages are read
+only when a question is actually used. Files are written to a temporary name and renamed, so a
+crash never leaves a half-written snapshot behind.
+
+The header records the id of the database it was taken from (database_manager.get_database_id).
+Versions restart when a database is recreated, so a snapshot of another database is never loaded.
+"""
+import json
+import os
+import struct
+
+import numpy as np
+import pandas as pd
+
+from question_store import TEXT_COLUMNS, QuestionStore, TextArena
+
+MAGIC = b"PREPSNP1"
+FORMAT = 2
+ALIGN = 64
+
+
+def snapshot_dir(db_path):
+    """prepify.db -> prepify_snapshots/ next to it."""
+    return os.path.splitext(os.path.abspath(db_path))[0] + "_snapshots"
+
+
+def snapshot_path(directory, version):
+    return os.path.join(directory, f"questions-v{version}.snap")
+
+
+def latest_snapshot(directory):
+    """(version, path) of the newest snapshot file, or None."""
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return None
+    versions = []
+    for name in names:
+        if name.startswith("questions-v") and name.endswith(".snap"):
+            try:
+                versions.append(int(name[len("questions-v"):-len(".snap")]))
+            except ValueError:
+                pass
+    if not versions:
+        return None
+    return max(versions), snapshot_path(directory, max(versions))
+
+
+def _arrays(store):
+    arrays = {
+        "ids": store.ids,
+        "category_codes": store.category.codes,
+        "subject_codes": store.subject.codes,
+    }
+    if not store.lazy:
+        arrays["answer_code"] = store.answer_code
+        for col in TEXT_COLUMNS:
+            arrays[f"{col}_data"] = store.texts[col].data
+            arrays[f"{col}_offsets"] = store.texts[col].offsets
+    return {name: np.ascontiguousarray(a) for name, a in arrays.items()}
+
+
+def save_snapshot(store, version, directory, db_id=""):
+    """Writes the store as the snapshot for this data version and removes older ones. Returns the path."""
+    os.makedirs(directory, exist_ok=True)
+    arrays = _arrays(store)
+    # 1. Header: where each array starts, relative to the end of the header block
+    layout, offset = {}, 0
+    for name, a in arrays.items():
+        layout[name] = [a.dtype.str, offset, len(a)]
+        offset += -(-a.nbytes // ALIGN) * ALIGN
+    header = json.dumps({
+        "format": FORMAT,
+        "version": version,
+        "db_id": db_id,
+        "rows": len(store),
+        "lazy": store.lazy,
+        "categories": [str(c) for c in store.category.categories],
+        "subjects": [str(c) for c in store.subject.categories],
+        "answer_text": {str(k): v for k, v in store.answer_text.items()},
+        "arrays": layout,
+    }).encode("utf-8")
+    header_size = -(-(len(MAGIC) + 8 + len(header)) // ALIGN) * ALIGN
+    # 2. Write under a temporary name, then rename into place
+    path = snapshot_path(directory, version)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + struct.pack("<Q", len(header)) + header)
+        for name, a in arrays.items():
+            f.seek(header_size + layout[name][1])
+            f.write(a.tobytes())
+        f.truncate(header_size + offset)
+    os.replace(tmp, path)
+    # 3. Older versions are no longer needed (a file still mapped on Windows is removed next time)
+    for name in os.listdir(directory):
+        other = os.path.join(directory, name)
+        if other != path and name.startswith("questions-v") and name.endswith(".snap"):
+            try:
+                os.remove(other)
+            except OSError:
+                pass
+    return path
+
+
+def load_snapshot(path, text_cache=None, db_id=""):
+    """Memory-maps a snapshot. Returns (version, store), or None if the file is missing, unreadable
+    or was taken from a database other than db_id."""
+    try:
+        with open(path, "rb") as f:
+            prefix = f.read(len(MAGIC) + 8)
+            if prefix[:len(MAGIC)] != MAGIC:
+                return None
+            header_len = struct.unpack("<Q", prefix[len(MAGIC):])[0]
+            header = json.loads(f.read(header_len))
+        if header.get("format") != FORMAT or header.get("db_id") != db_id:
+            return None
+        header_size = -(-(len(MAGIC) + 8 + header_len) // ALIGN) * ALIGN
+        raw = np.memmap(path, dtype=np.uint8, mode="r")
+
+        def array(name):
+            dtype, start, count = header["arrays"][name]
+            dtype = np.dtype(dtype)
+            start += header_size
+            return raw[start:start + count * dtype.itemsize].view(dtype)
+
+        store = QuestionStore(
+            ids=array("ids"),
+            category=pd.Categorical.from_codes(array("category_codes"), categories=header["categories"]),
+            subject=pd.Categorical.from_codes(array("subject_codes"), categories=header["subjects"]),
+            answer_code=None if header["lazy"] else array("answer_code"),
+            answer_text={int(k): v for k, v in header["answer_text"].items()},
+            texts=None if header["lazy"] else {
+                col: TextArena(array(f"{col}_data"), array(f"{col}_offsets")) for col in TEXT_COLUMNS},
+            text_cache=text_cache if header["lazy"] else None,
+        )
+        if len(store) != header["rows"]:
+            return None
+        return header["version"], store
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        print(f"Snapshot Error: {e}")
+        return None
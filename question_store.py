@@ -0,0 +1,240 @@
+"""
+question_store.py
+-----------------
+Compact in-memory question bank.
+Category and Subject are pandas categoricals, the answer is a small code pointing at one of the
+four options, and question/option text lives in one UTF-8 buffer per column instead of one
+Python str object per cell.
+In lazy mode only rowid, Category and Subject stay resident; question text is fetched per quiz
+and kept in a bounded LRU cache.
+"""
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+TEXT_COLUMNS = ("Question", "Option1", "Option2", "Option3", "Option4")
+# Column order of the DataFrames handed to QuizFrame, ReviewFrame and report_generator
+FRAME_COLUMNS = ("Category", "Subject", "Question", "Option1", "Option2", "Option3", "Option4", "Answer")
+
+
+class TextArena:
+    """Many strings packed into one UTF-8 byte buffer plus an offsets array."""
+
+    def __init__(self, data, offsets):
+        self.data = data          # np.uint8 array with every string back to back
+        self.offsets = offsets    # np.int64 array, string i is data[offsets[i]:offsets[i + 1]]
+
+    @classmethod
+    def from_strings(cls, strings):
+        encoded = [str(s).encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def get(self, i):
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def take(self, positions):
+        """New arena holding only the given strings, gathered without a Python loop."""
+        positions = np.asarray(positions, dtype=np.int64)
+        starts = self.offsets[positions]
+        lengths = self.offsets[positions + 1] - starts
+        offsets = np.zeros(len(positions) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        # Byte j of the output comes from starts[k] + (j - offsets[k]) for the string k it belongs to
+        byte_index = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1], dtype=np.int64)
+        return TextArena(self.data[byte_index], offsets)
+
+    @staticmethod
+    def concat(arenas):
+        data = np.concatenate([a.data for a in arenas])
+        offsets, base = [np.zeros(1, dtype=np.int64)], 0
+        for a in arenas:
+            offsets.append(a.offsets[1:] + base)
+            base += a.offsets[-1]
+        return TextArena(data, np.concatenate(offsets))
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes + self.offsets.nbytes
+
+
+class QuestionTextCache:
+    """Bounded LRU cache of question bodies for lazy stores.
+    loader(ids) must return a DataFrame indexed by rowid with the text columns and Answer."""
+
+    def __init__(self, loader, capacity=2000):
+        self.loader = loader
+        self.capacity = capacity
+        self._rows = OrderedDict()
+
+    def get_many(self, ids):
+        """{rowid: {column: value}} for the given rowids, fetching all misses in one batch."""
+        ids = [int(i) for i in ids]
+        missing = [i for i in ids if i not in self._rows]
+        if missing:
+            fresh = self.loader(missing)
+            for rowid, row in zip(fresh.index, fresh[list(TEXT_COLUMNS) + ["Answer"]].itertuples(index=False)):
+                self._rows[int(rowid)] = dict(zip(list(TEXT_COLUMNS) + ["Answer"], row))
+        out = {}
+        for i in ids:
+            if i in self._rows:
+                self._rows.move_to_end(i)
+                out[i] = self._rows[i]
+        # Evict least recently used, but never the rows this call is returning
+        while len(self._rows) > max(self.capacity, len(out)):
+            self._rows.popitem(last=False)
+        return out
+
+    def invalidate(self, ids):
+        for i in ids:
+            self._rows.pop(int(i), None)
+
+    def clear(self):
+        self._rows.clear()
+
+
+class QuestionStore:
+    """The question bank as compact columns, one position per question (ordered by rowid).
+    A lazy store (texts is None) keeps no question text and reads it through text_cache."""
+
+    def __init__(self, ids, category, subject, answer_code, answer_text, texts, text_cache=None):
+        self.ids = ids                    # np.int64 rowids
+        self.category = category          # pd.Categorical
+        self.subject = subject            # pd.Categorical
+        self.answer_code = answer_code    # np.int8: 0-3 = Option1-4, -1 = answer not among the options
+        self.answer_text = answer_text    # {rowid: answer} for the rare -1 rows
+        self.texts = texts                # {column: TextArena}, or None when lazy
+        self.text_cache = text_cache      # QuestionTextCache, lazy stores only
+
+    @property
+    def lazy(self):
+        return self.texts is None
+
+    @classmethod
+    def from_frame(cls, df):
+        """Builds a store from a DataFrame indexed by rowid (the shape db.get_questions() returns)."""
+        if df.empty or not set(FRAME_COLUMNS) <= set(df.columns):
+            df = pd.DataFrame(columns=list(FRAME_COLUMNS), index=pd.Index([], dtype=np.int64, name="rowid"))
+        df = df.sort_index()
+        options = df[["Option1", "Option2", "Option3", "Option4"]].astype(str).to_numpy()
+        answers = df["Answer"].astype(str).to_numpy()
+        matches = options == answers[:, None]
+        answer_code = np.where(matches.any(axis=1), matches.argmax(axis=1), -1).astype(np.int8)
+        ids = df.index.to_numpy(dtype=np.int64)
+        answer_text = {int(ids[i]): answers[i] for i in np.flatnonzero(answer_code < 0)}
+        return cls(
+            ids=ids,
+            category=pd.Categorical(df["Category"].astype(str)),
+            subject=pd.Categorical(df["Subject"].astype(str)),
+            answer_code=answer_code,
+            answer_text=answer_text,
+            texts={col: TextArena.from_strings(df[col].to_numpy()) for col in TEXT_COLUMNS},
+        )
+
+    @classmethod
+    def from_meta(cls, df, text_cache):
+        """Lazy store: only rowid, Category and Subject from df are kept."""
+        if df.empty or not {"Category", "Subject"} <= set(df.columns):
+            df = pd.DataFrame(columns=["Category", "Subject"], index=pd.Index([], dtype=np.int64, name="rowid"))
+        df = df.sort_index()
+        return cls(
+            ids=df.index.to_numpy(dtype=np.int64),
+            category=pd.Categorical(df["Category"].astype(str)),
+            subject=pd.Categorical(df["Subject"].astype(str)),
+            answer_code=None,
+            answer_text={},
+            texts=None,
+            text_cache=text_cache,
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def empty(self):
+        return len(self.ids) == 0
+
+    def _answers(self, positions):
+        out = []
+        for pos in positions:
+            code = self.answer_code[pos]
+            if code >= 0:
+                out.append(self.texts[f"Option{code + 1}"].get(pos))
+            else:
+                out.append(self.answer_text.get(int(self.ids[pos]), "N/A"))
+        return out
+
+    def take(self, positions):
+        """Materializes the given positions as a small DataFrame (index = rowid) with the usual columns."""
+        positions = np.asarray(positions, dtype=np.int64)
+        data = {
+            "Category": np.asarray(self.category[positions], dtype=object),
+            "Subject": np.asarray(self.subject[positions], dtype=object),
+        }
+        if self.lazy:
+            # One batched fetch for whatever the LRU cache does not hold yet
+            rows = self.text_cache.get_many(self.ids[positions])
+            empty = dict.fromkeys(list(TEXT_COLUMNS) + ["Answer"], "N/A")
+            picked = [rows.get(int(i), empty) for i in self.ids[positions]]
+            for col in list(TEXT_COLUMNS) + ["Answer"]:
+                data[col] = [r[col] for r in picked]
+        else:
+            for col in TEXT_COLUMNS:
+                data[col] = [self.texts[col].get(p) for p in positions]
+            data["Answer"] = self._answers(positions)
+        return pd.DataFrame(data, index=pd.Index(self.ids[positions], name="rowid"), columns=list(FRAME_COLUMNS))
+
+    def record(self, position):
+        """One question as a dict, the same keys QuizFrame reads."""
+        return self.take([position]).iloc[0].to_dict()
+
+    def subset(self, positions):
+        """A new store holding only the given positions (no text is decoded)."""
+        positions = np.asarray(positions, dtype=np.int64)
+        ids = self.ids[positions]
+        keep = set(ids.tolist())
+        return QuestionStore(
+            ids=ids,
+            category=self.category[positions],
+            subject=self.subject[positions],
+            answer_code=None if self.lazy else self.answer_code[positions],
+            answer_text={k: v for k, v in self.answer_text.items() if k in keep},
+            texts=None if self.lazy else {col: arena.take(positions) for col, arena in self.texts.items()},
+            text_cache=self.text_cache,
+        )
+
+    def apply_changes(self, changed_ids, fresh_df):
+        """New store with changed rowids replaced by fresh_df's rows (deleted ones simply disappear)."""
+        kept = self.subset(np.flatnonzero(~np.isin(self.ids, np.asarray(changed_ids, dtype=np.int64))))
+        if self.lazy:
+            self.text_cache.invalidate(changed_ids)
+        if fresh_df.empty:
+            return kept
+        fresh = QuestionStore.from_meta(fresh_df, self.text_cache) if self.lazy else QuestionStore.from_frame(fresh_df)
+        merged = QuestionStore(
+            ids=np.concatenate([kept.ids, fresh.ids]),
+            category=pd.api.types.union_categoricals([kept.category, fresh.category]),
+            subject=pd.api.types.union_categoricals([kept.subject, fresh.subject]),
+            answer_code=None if self.lazy else np.concatenate([kept.answer_code, fresh.answer_code]),
+            answer_text={**kept.answer_text, **fresh.answer_text},
+            texts=None if self.lazy else {col: TextArena.concat([kept.texts[col], fresh.texts[col]]) for col in TEXT_COLUMNS},
+            text_cache=self.text_cache,
+        )
+        # Keep positions ordered by rowid
+        return merged.subset(np.argsort(merged.ids, kind="stable"))
+
+    @property
+    def nbytes(self):
+        """Approximate resident size of the store in bytes."""
+        total = self.ids.nbytes
+        for cat in (self.category, self.subject):
+            total += cat.codes.nbytes + sum(len(str(c).encode("utf-8")) + 49 for c in cat.categories)
+        if not self.lazy:
+            total += self.answer_code.nbytes + sum(arena.nbytes for arena in self.texts.values())
+        total += sum(len(v.encode("utf-8")) + 49 for v in self.answer_text.values())
+        return total
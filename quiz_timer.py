@@ -0,0 +1,91 @@
+"""
+quiz_timer.py
+-------------
+Countdown for a quiz session, based on time.monotonic() deadlines instead of counting ticks,
+so a busy UI thread delays the label update but never the clock itself.
+Standard-style quizzes have one total budget; Sprint gives every question its own budget.
+Only one root.after() callback is ever pending, and stop() cancels it.
+"""
+import math
+import time
+
+
+class QuizTimer:
+    def __init__(self, root, on_tick, on_expire):
+        """on_tick(seconds_left) updates the display; on_expire(kind) runs when a budget is used up,
+        kind is "question" (per-question budget) or "total"."""
+        self.root = root
+        self.on_tick = on_tick
+        self.on_expire = on_expire
+        self._after_id = None
+        self.running = False
+        self.total_deadline = None
+        self.question_budget = None
+        self.question_deadline = None
+        self.question_started = None
+        self.started = None
+
+    def start(self, total_seconds=None, per_question_seconds=None):
+        """Starts a new session. Call start_question() whenever a question is shown."""
+        self.stop()
+        now = time.monotonic()
+        self.started = now
+        self.total_deadline = now + total_seconds if total_seconds else None
+        self.question_budget = per_question_seconds
+        self.question_started = now
+        self.question_deadline = None
+        self.running = True
+
+    def start_question(self):
+        """Marks the start of a question: resets its clock and, in per-question mode, its budget."""
+        now = time.monotonic()
+        self.question_started = now
+        if self.question_budget:
+            self.question_deadline = now + self.question_budget
+        if self.running:
+            self._tick()
+
+    def question_elapsed(self):
+        """Seconds since the current question was shown."""
+        return 0.0 if self.question_started is None else time.monotonic() - self.question_started
+
+    def elapsed(self):
+        return 0.0 if self.started is None else time.monotonic() - self.started
+
+    def remaining(self):
+        """Seconds left on whichever budget runs out first."""
+        deadlines = [d for d in (self.total_deadline, self.question_deadline) if d is not None]
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - time.monotonic())
+
+    def stop(self):
+        self.running = False
+        self._cancel()
+
+    def _cancel(self):
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _tick(self):
+        self._cancel()
+        if not self.running:
+            return
+        left = self.remaining()
+        if left is None:
+            return
+        if left <= 0:
+            now = time.monotonic()
+            kind = "total" if self.total_deadline is not None and now >= self.total_deadline else "question"
+            if kind == "total":
+                self.running = False
+            self.on_expire(kind)
+            return
+        self.on_tick(int(math.ceil(left)))
+        # Wake up just after the displayed whole second changes
+        delay_ms = int((left - math.floor(left)) * 1000) + 5
+        self._after_id = self.root.after(delay_ms, self._tick)
@@ -7,10 +7,12 @@ from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 from reportlab.lib import colors
 from tkinter import messagebox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from chart_service import PieChart, get_chart
+from scoring import QuizScore
 
-def save_quiz_pdf(ignored_path, user, cat, score, total, start_time, quiz_data, answers):
+def save_quiz_pdf(ignored_path, user, cat, score, total, start_time, quiz_data, answers, quiz_score=None):
+    if quiz_score is None:
+        quiz_score = QuizScore(quiz_data, answers)
     # 1. FIND DOWNLOADS FOLDER AUTOMATICALLY
     downloads_path = str(Path.home() / "Downloads")
     
@@ -50,14 +52,14 @@ def save_quiz_pdf(ignored_path, user, cat, score, total, start_time, quiz_data,
     
     # --- QUESTIONS SECTION ---
     y -= 30
-    for i, q in quiz_data.iterrows():
+    for pos, (i, q) in enumerate(quiz_data.iterrows()):
         if y < 150: 
             c.showPage()
             y = 750
 
         u_ans = answers.get(i, "None")
         cor_ans = str(q['Answer'])
-        is_correct = str(u_ans).strip().lower() == cor_ans.strip().lower()
+        is_correct = quiz_score.is_correct(pos)
 
         c.setFont("Helvetica-Bold", 12)
         c.drawString(60, y, f"Q{i+1}:")
@@ -102,38 +104,10 @@ def save_quiz_pdf(ignored_path, user, cat, score, total, start_time, quiz_data,
 
 
 def generate_pie_chart(parent, score, total, appearance_mode):
-    plt.close('all')
-    # 1. Force the figure to use the exact grey background color of your card
+    """Results pie on the pooled figure and canvas (see chart_service.py). Returns the canvas.
+    parent is the chart container of the kept Results screen, so every finished quiz reuses the same pie."""
+    # 1. The chart matches the exact grey background color of the card
     # Light mode grey: #ebebeb | Dark mode grey: #2b2b2b
-    bg_hex = "#ebebeb" if appearance_mode.lower() == "light" else "#2b2b2b"
-    
-    # Create figure with the specific background color instead of 'none'
-    fig, ax = plt.subplots(figsize=(5, 4), dpi=100, facecolor=bg_hex)
-    ax.set_facecolor(bg_hex)
-    
-    labels = ['Correct', 'Incorrect']
-    sizes = [score, total - score]
-    
-    # Set text color based on mode
-    text_col = "black" if appearance_mode.lower() == "light" else "white"
-    
-    # Draw the pie
-    ax.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90, 
-           colors=['#4CAF50', '#E91E63'], 
-           textprops={'color': text_col, 'fontsize': 10})
-    
-    ax.axis('equal')
-    plt.tight_layout(pad=2.0)
-    
-    canvas_obj = FigureCanvasTkAgg(fig, master=parent)
-    canvas_widget = canvas_obj.get_tk_widget()
-
-    # 2. Force the Tkinter widget to match the same color and remove borders
-    canvas_widget.configure(
-        bg=bg_hex, 
-        highlightthickness=0, 
-        borderwidth=0
-    )
-    
-    return canvas_obj
-
+    chart = get_chart("results_pie", parent, PieChart)
+    # 2. Only the wedges and labels change; an earlier identical result is restored from the image cache
+    return chart.set_data(score, total, appearance_mode)
@@ -0,0 +1,291 @@
+"""
+schema_migrations.py
+--------------------
+Versioned schema upgrades for the Prepify database.
+The current version lives in PRAGMA user_version; each migration runs once, in order, in its own transaction.
+"""
+import sqlite3
+import uuid
+
+
+def table_columns(conn, table):
+    """Returns the lower-cased column names of a table (empty set if it does not exist)."""
+    return {row[1].lower() for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _add_column_if_missing(conn, table, column, decl):
+    if column.lower() not in table_columns(conn, table):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def _m001_baseline(conn):
+    # One definition for every table, shared by init_db() and setup_database.py
+    conn.execute("""CREATE TABLE IF NOT EXISTS users (
+                    username TEXT UNIQUE,
+                    password TEXT,
+                    is_admin INTEGER DEFAULT 0)""")
+    conn.execute("""CREATE TABLE IF NOT EXISTS questions (
+                    Category TEXT, Subject TEXT, Question TEXT,
+                    Option1 TEXT, Option2 TEXT, Option3 TEXT,
+                    Option4 TEXT, Answer TEXT)""")
+    conn.execute("""CREATE TABLE IF NOT EXISTS quiz_history (
+                    username TEXT, score INTEGER, total INTEGER,
+                    percentage REAL, timestamp DATETIME)""")
+    conn.execute("""CREATE TABLE IF NOT EXISTS subject_performance (
+                    username TEXT, subject TEXT, correct INTEGER,
+                    total INTEGER, timestamp DATETIME)""")
+    conn.execute("""CREATE TABLE IF NOT EXISTS quiz_results (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT,
+                    subject TEXT,
+                    score_percent REAL,
+                    date TEXT,
+                    category_name TEXT)""")
+    # Databases created by the old init_db() never had this column
+    _add_column_if_missing(conn, "quiz_results", "category_name", "TEXT")
+
+
+def _m002_lookup_indexes(conn):
+    # Usernames are matched case-insensitively, so the indexes use NOCASE and the queries use "= ? COLLATE NOCASE".
+    # quiz_results: covers the dashboard counts, recent activity and progress graph without touching the table
+    conn.execute("""CREATE INDEX IF NOT EXISTS idx_quiz_results_user_date
+                    ON quiz_results (user_id COLLATE NOCASE, date, score_percent, subject, category_name)""")
+    # subject_performance: covers the weakest-subject aggregate
+    conn.execute("""CREATE INDEX IF NOT EXISTS idx_subject_perf_user_subject
+                    ON subject_performance (username COLLATE NOCASE, subject, correct, total)""")
+    conn.execute("""CREATE INDEX IF NOT EXISTS idx_quiz_history_user
+                    ON quiz_history (username)""")
+    # questions: quiz pool selection by category and subject
+    conn.execute("""CREATE INDEX IF NOT EXISTS idx_questions_category_subject
+                    ON questions (Category, Subject)""")
+
+
+# Columns mirrored into the full-text index, in bm25() weight order
+FTS_COLUMNS = ("Question", "Option1", "Option2", "Option3", "Option4", "Subject", "Category")
+
+
+def _m003_question_search(conn):
+    # External-content FTS5 table: stores only the index, the text stays in questions
+    cols = ", ".join(FTS_COLUMNS)
+    new_vals = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+    old_vals = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+    try:
+        conn.execute(f"""CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+                         {cols}, content='questions', content_rowid='rowid',
+                         tokenize='unicode61 remove_diacritics 2', prefix='2 3')""")
+    except sqlite3.OperationalError as e:
+        # SQLite built without FTS5: search falls back to LIKE
+        print(f"FTS5 unavailable, question search will use LIKE: {e}")
+        return
+    # Triggers keep the index in sync with every insert, edit and delete
+    conn.execute(f"""CREATE TRIGGER IF NOT EXISTS questions_fts_ai AFTER INSERT ON questions BEGIN
+                         INSERT INTO questions_fts(rowid, {cols}) VALUES (new.rowid, {new_vals});
+                     END""")
+    conn.execute(f"""CREATE TRIGGER IF NOT EXISTS questions_fts_ad AFTER DELETE ON questions BEGIN
+                         INSERT INTO questions_fts(questions_fts, rowid, {cols}) VALUES ('delete', old.rowid, {old_vals});
+                     END""")
+    conn.execute(f"""CREATE TRIGGER IF NOT EXISTS questions_fts_au AFTER UPDATE ON questions BEGIN
+                         INSERT INTO questions_fts(questions_fts, rowid, {cols}) VALUES ('delete', old.rowid, {old_vals});
+                         INSERT INTO questions_fts(rowid, {cols}) VALUES (new.rowid, {new_vals});
+                     END""")
+    # Index the questions that already exist
+    conn.execute("INSERT INTO questions_fts(questions_fts) VALUES ('rebuild')")
+
+
+def _m004_question_change_log(conn):
+    # Every insert/edit/delete on questions appends a row here. The AUTOINCREMENT counter
+    # is the question bank's data version, so the app can re-read only what changed.
+    conn.execute("""CREATE TABLE IF NOT EXISTS question_changes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    question_id INTEGER NOT NULL)""")
+    for name, event, ref in (("ai", "INSERT", "new"), ("au", "UPDATE", "new"), ("ad", "DELETE", "old")):
+        conn.execute(f"""CREATE TRIGGER IF NOT EXISTS question_changes_{name} AFTER {event} ON questions BEGIN
+                             INSERT INTO question_changes (question_id) VALUES ({ref}.rowid);
+                         END""")
+
+
+def _m005_result_upserts(conn):
+    # subject_performance becomes one running total per (username, subject) so saves can upsert.
+    # username is NOCASE on the column itself, so "Ali" and "ali" hit the same unique key.
+    conn.execute("""CREATE TABLE subject_performance_new (
+                    username TEXT COLLATE NOCASE NOT NULL,
+                    subject TEXT NOT NULL,
+                    correct INTEGER NOT NULL DEFAULT 0,
+                    total INTEGER NOT NULL DEFAULT 0,
+                    timestamp DATETIME,
+                    UNIQUE (username, subject))""")
+    # Fold the old one-row-per-quiz history into the totals
+    conn.execute("""INSERT INTO subject_performance_new (username, subject, correct, total, timestamp)
+                    SELECT MIN(username), subject, SUM(COALESCE(correct, 0)), SUM(COALESCE(total, 0)), MAX(timestamp)
+                    FROM subject_performance
+                    WHERE username IS NOT NULL AND subject IS NOT NULL
+                    GROUP BY username COLLATE NOCASE, subject""")
+    conn.execute("DROP TABLE subject_performance")
+    conn.execute("ALTER TABLE subject_performance_new RENAME TO subject_performance")
+    conn.execute("""CREATE INDEX IF NOT EXISTS idx_subject_perf_user_subject
+                    ON subject_performance (username COLLATE NOCASE, subject, correct, total)""")
+    # One row per answered question; session_id is the quiz_results row of that quiz
+    conn.execute("""CREATE TABLE IF NOT EXISTS question_attempts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id INTEGER NOT NULL,
+                    username TEXT COLLATE NOCASE NOT NULL,
+                    question_id INTEGER NOT NULL,
+                    chosen TEXT,
+                    is_correct INTEGER NOT NULL,
+                    time_spent REAL,
+                    answered_at TEXT)""")
+    conn.execute("""CREATE INDEX IF NOT EXISTS idx_question_attempts_user_question
+                    ON question_attempts (username, question_id)""")
+    conn.execute("""CREATE INDEX IF NOT EXISTS idx_question_attempts_question
+                    ON question_attempts (question_id, is_correct)""")
+
+
+def _m006_quiz_sessions(conn):
+    # A session is opened when a quiz starts, so attempts can be logged before any result exists.
+    # question_attempts.session_id points here; result_id is filled in when the quiz is saved.
+    conn.execute("""CREATE TABLE IF NOT EXISTS quiz_sessions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT COLLATE NOCASE NOT NULL,
+                    started_at TEXT,
+                    result_id INTEGER)""")
+    # Attempts saved so far used the quiz_results id as their session id
+    conn.execute("""INSERT OR IGNORE INTO quiz_sessions (id, username, started_at, result_id)
+                    SELECT session_id, MIN(username), MIN(answered_at), session_id
+                    FROM question_attempts GROUP BY session_id""")
+    # The log is append-only: the latest row per (session, question) is the answer that counted
+    conn.execute("""CREATE INDEX IF NOT EXISTS idx_question_attempts_session
+                    ON question_attempts (session_id, question_id)""")
+
+
+def _m007_question_stats(conn):
+    # Written by item_analysis.py: classical test statistics per question
+    conn.execute("""CREATE TABLE IF NOT EXISTS question_stats (
+                    question_id INTEGER PRIMARY KEY,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    p_value REAL,
+                    discrimination REAL,
+                    option1_rate REAL,
+                    option2_rate REAL,
+                    option3_rate REAL,
+                    option4_rate REAL,
+                    updated_at TEXT)""")
+
+
+def _m008_user_question_stats(conn):
+    # Running per-user, per-question history for the Adaptive quiz mode, upserted on every save
+    conn.execute("""CREATE TABLE IF NOT EXISTS user_question_stats (
+                    username TEXT COLLATE NOCASE NOT NULL,
+                    question_id INTEGER NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    wrong INTEGER NOT NULL DEFAULT 0,
+                    last_seen TEXT,
+                    PRIMARY KEY (username, question_id)) WITHOUT ROWID""")
+    # Seed it from the attempts logged so far (last answer per question per quiz)
+    conn.execute("""INSERT OR IGNORE INTO user_question_stats (username, question_id, attempts, wrong, last_seen)
+                    SELECT username, question_id, COUNT(*), SUM(1 - is_correct), MAX(answered_at)
+                    FROM (SELECT username, question_id, is_correct, answered_at, MAX(id)
+                          FROM question_attempts GROUP BY session_id, question_id)
+                    GROUP BY username COLLATE NOCASE, question_id""")
+
+
+def _m009_review_schedule(conn):
+    # Spaced-repetition state per (user, question); the (username, due_at) index serves "what is due now"
+    conn.execute("""CREATE TABLE IF NOT EXISTS review_schedule (
+                    username TEXT COLLATE NOCASE NOT NULL,
+                    question_id INTEGER NOT NULL,
+                    reps INTEGER NOT NULL DEFAULT 0,
+                    interval_days REAL NOT NULL DEFAULT 0,
+                    ease REAL NOT NULL DEFAULT 2.5,
+                    due_at TEXT NOT NULL,
+                    last_review TEXT,
+                    PRIMARY KEY (username, question_id)) WITHOUT ROWID""")
+    conn.execute("""CREATE INDEX IF NOT EXISTS idx_review_schedule_due
+                    ON review_schedule (username, due_at)""")
+    # Questions answered before this existed are due for a first review right away
+    conn.execute("""INSERT OR IGNORE INTO review_schedule (username, question_id, due_at, last_review)
+                    SELECT username, question_id, COALESCE(last_seen, ''), last_seen FROM user_question_stats""")
+
+
+def _m010_user_stats(conn):
+    # Quiz count and score total per user, kept current by triggers on quiz_results, so the dashboard
+    # reads one row instead of aggregating the whole history. scored counts the rows with a score (AVG ignores NULLs).
+    conn.execute("""CREATE TABLE IF NOT EXISTS user_stats (
+                    username TEXT COLLATE NOCASE NOT NULL PRIMARY KEY,
+                    quiz_count INTEGER NOT NULL DEFAULT 0,
+                    scored INTEGER NOT NULL DEFAULT 0,
+                    score_sum REAL NOT NULL DEFAULT 0) WITHOUT ROWID""")
+    add = """INSERT INTO user_stats (username, quiz_count, scored, score_sum)
+             VALUES (new.user_id, 1, new.score_percent IS NOT NULL, COALESCE(new.score_percent, 0))
+             ON CONFLICT (username) DO UPDATE SET
+                 quiz_count = quiz_count + 1,
+                 scored = scored + excluded.scored,
+                 score_sum = score_sum + excluded.score_sum;"""
+    remove = """UPDATE user_stats SET
+                    quiz_count = quiz_count - 1,
+                    scored = scored - (old.score_percent IS NOT NULL),
+                    score_sum = score_sum - COALESCE(old.score_percent, 0)
+                WHERE username = old.user_id;
+                DELETE FROM user_stats WHERE username = old.user_id AND quiz_count <= 0;"""
+    conn.execute(f"""CREATE TRIGGER IF NOT EXISTS user_stats_ai AFTER INSERT ON quiz_results
+                     WHEN new.user_id IS NOT NULL BEGIN {add} END""")
+    conn.execute(f"""CREATE TRIGGER IF NOT EXISTS user_stats_ad AFTER DELETE ON quiz_results
+                     WHEN old.user_id IS NOT NULL BEGIN {remove} END""")
+    conn.execute(f"""CREATE TRIGGER IF NOT EXISTS user_stats_au_old AFTER UPDATE OF user_id, score_percent ON quiz_results
+                     WHEN old.user_id IS NOT NULL BEGIN {remove} END""")
+    conn.execute(f"""CREATE TRIGGER IF NOT EXISTS user_stats_au_new AFTER UPDATE OF user_id, score_percent ON quiz_results
+                     WHEN new.user_id IS NOT NULL BEGIN {add} END""")
+    # Seed it from the results saved so far
+    conn.execute("""INSERT OR IGNORE INTO user_stats (username, quiz_count, scored, score_sum)
+                    SELECT MIN(user_id), COUNT(*), COUNT(score_percent), COALESCE(SUM(score_percent), 0)
+                    FROM quiz_results WHERE user_id IS NOT NULL
+                    GROUP BY user_id COLLATE NOCASE""")
+
+
+def _m011_database_identity(conn):
+    # A random id made once per database file's lineage. Data versions (question_changes seq) restart
+    # in a recreated database, so caches kept outside the file (question snapshots) check this id too.
+    conn.execute("""CREATE TABLE IF NOT EXISTS db_identity (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    uuid TEXT NOT NULL)""")
+    conn.execute("INSERT OR IGNORE INTO db_identity (id, uuid) VALUES (1, ?)", (uuid.uuid4().hex,))
+
+
+# (version, description, function) - append new entries, never edit or reorder old ones
+MIGRATIONS = [
+    (1, "baseline tables", _m001_baseline),
+    (2, "lookup indexes", _m002_lookup_indexes),
+    (3, "question full-text search", _m003_question_search),
+    (4, "question change log", _m004_question_change_log),
+    (5, "subject totals upsert key and question attempts", _m005_result_upserts),
+    (6, "quiz sessions for the attempt log", _m006_quiz_sessions),
+    (7, "question item statistics", _m007_question_stats),
+    (8, "per-user question history", _m008_user_question_stats),
+    (9, "spaced-repetition review schedule", _m009_review_schedule),
+    (10, "per-user quiz totals", _m010_user_stats),
+    (11, "database identity", _m011_database_identity),
+]
+
+
+def get_schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """Applies every pending migration and returns the resulting schema version."""
+    if conn.in_transaction:
+        conn.commit()
+    current = get_schema_version(conn)
+    for version, description, upgrade in MIGRATIONS:
+        if version <= current:
+            continue
+        try:
+            # DDL does not open a transaction implicitly, so begin one explicitly
+            conn.execute("BEGIN")
+            upgrade(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            raise RuntimeError(f"Schema migration {version} ({description}) failed: {e}") from e
+        current = version
+    return current
@@ -0,0 +1,57 @@
+"""
+scoring.py
+----------
+Scores a finished quiz once: correctness per question, total score and per-subject breakdown.
+The same QuizScore is handed to the results save, the review screen and the PDF report.
+"""
+import pandas as pd
+
+
+def normalize_answer(value):
+    """The one comparison rule: surrounding whitespace and letter case are ignored."""
+    return str(value).strip().casefold()
+
+
+# What the quiz screen's radio variable holds while no option is selected
+NO_ANSWER = "None"
+
+
+def is_answered(given):
+    """True if an option was chosen: None, blank and the unselected radio value all mean skipped."""
+    if given is None:
+        return False
+    text = str(given).strip()
+    return text != "" and text != NO_ANSWER
+
+
+def is_correct_answer(given, answer):
+    """Scalar check, for grading a single question as it is answered (e.g. Sudden Death)."""
+    if not is_answered(given):
+        return False
+    return normalize_answer(given) == normalize_answer(answer)
+
+
+class QuizScore:
+    """Correctness of every question in quiz_data, given answers {quiz_data index label: chosen option}."""
+
+    def __init__(self, quiz_data, answers):
+        # 1. Line the answers up with the quiz rows once
+        given = pd.Series([answers.get(i) for i in quiz_data.index], index=quiz_data.index, dtype=object)
+        answered = pd.Series([is_answered(v) for v in given], index=quiz_data.index, dtype=bool)
+        # 2. Compare whole columns at once
+        matches = given.astype(str).str.strip().str.casefold() == quiz_data["Answer"].astype(str).str.strip().str.casefold()
+        self.answered = answered.to_numpy(dtype=bool)
+        self.correct = (answered & matches).to_numpy(dtype=bool)
+        self.total = len(quiz_data)
+        self.score = int(self.correct.sum())
+        self.percentage = (self.score / self.total) * 100 if self.total else 0.0
+        # 3. Per-subject breakdown in one groupby, subjects in order of first appearance
+        if self.total and "Subject" in quiz_data.columns:
+            grouped = pd.DataFrame({"Subject": quiz_data["Subject"].astype(str).to_numpy(), "correct": self.correct}) \
+                .groupby("Subject", sort=False)["correct"].agg(["sum", "count"])
+            self.by_subject = [(subj, int(row["sum"]), int(row["count"])) for subj, row in grouped.iterrows()]
+        else:
+            self.by_subject = []
+
+    def is_correct(self, position):
+        return bool(self.correct[position])
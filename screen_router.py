@@ -0,0 +1,78 @@
+"""
+screen_router.py
+----------------
+Keeps built screens alive between visits instead of destroying and rebuilding their widgets.
+Screens are direct children of the root window. Only one is packed at a time; the others are
+hidden with pack_forget(). The least recently shown screen is destroyed once more than
+`capacity` are kept.
+
+Every screen has a key (e.g. the user it belongs to). Showing it again with the same key reuses
+it and calls its refresh hook; a different key rebuilds it.
+"""
+from collections import OrderedDict
+
+
+class Screen:
+    def __init__(self, widget, key, pack):
+        self.widget = widget
+        self.key = key
+        self.pack = pack
+
+
+class ScreenRouter:
+    def __init__(self, root, capacity=6):
+        self.root = root
+        self.capacity = capacity
+        self._screens = OrderedDict()
+        self.current = None
+
+    def show(self, name, build, key=None, refresh=None, **pack):
+        """Packs screen `name`, building it with build() (a widget whose master is root) if needed.
+        refresh(widget) runs when a kept screen is shown again. Returns the widget."""
+        self.hide()
+        screen = self._screens.get(name)
+        if screen is not None and (screen.key != key or not screen.widget.winfo_exists()):
+            self.drop(name)
+            screen = None
+        if screen is None:
+            screen = Screen(build(), key, pack or {"fill": "both", "expand": True})
+            self._screens[name] = screen
+            self._evict()
+        else:
+            self._screens.move_to_end(name)
+            if refresh:
+                refresh(screen.widget)
+        screen.widget.pack(**screen.pack)
+        self.current = name
+        return screen.widget
+
+    def get(self, name, key=None):
+        """The kept widget for name if it was built with this key, else None."""
+        screen = self._screens.get(name)
+        if screen is None or screen.key != key or not screen.widget.winfo_exists():
+            return None
+        return screen.widget
+
+    def owns(self, widget):
+        return any(screen.widget is widget for screen in self._screens.values())
+
+    def hide(self):
+        """Unpacks the current screen; it stays built for the next show()."""
+        name, self.current = self.current, None
+        screen = self._screens.get(name)
+        if screen is not None and screen.widget.winfo_exists():
+            screen.widget.pack_forget()
+
+    def drop(self, name=None):
+        """Destroys one kept screen, or all of them (e.g. on logout)."""
+        names = list(self._screens) if name is None else [name]
+        for n in names:
+            if n == self.current:
+                self.current = None
+            screen = self._screens.pop(n, None)
+            if screen is not None and screen.widget.winfo_exists():
+                screen.widget.destroy()
+
+    def _evict(self):
+        while len(self._screens) > self.capacity:
+            self.drop(next(iter(self._screens)))
@@ -1,71 +1,24 @@
 """
 setup_database.py
 -----------------
-Initializes a local SQLite database named Prepify.db with Hashed Passwords.
+Initializes the local SQLite database (database_manager.DB_NAME) with Hashed Passwords.
 """
 import sqlite3
 import bcrypt  
 from datetime import datetime
 
-# Connect or create Prepify database
-conn = sqlite3.connect('Prepify.db')
+from database_manager import DB_NAME
+from schema_migrations import migrate
+
+# Connect or create Prepify database (same file the app opens)
+conn = sqlite3.connect(DB_NAME)
 c = conn.cursor()
 
 # ---------------------------
 # Create tables
 # ---------------------------
-
-c.execute('''
-CREATE TABLE IF NOT EXISTS users (
-    username TEXT UNIQUE,
-    password TEXT,
-    is_admin INTEGER DEFAULT 0
-)
-''')
-
-c.execute('''
-CREATE TABLE IF NOT EXISTS questions (
-    QUESTION TEXT,
-    OPTION1 TEXT,
-    OPTION2 TEXT,
-    OPTION3 TEXT,
-    OPTION4 TEXT,
-    ANSWER TEXT,
-    CATEGORY TEXT,
-    SUBJECT TEXT
-)
-''')
-
-c.execute('''
-CREATE TABLE IF NOT EXISTS quiz_history (
-    username TEXT,
-    score INTEGER,
-    total INTEGER,
-    percentage REAL,
-    timestamp DATETIME
-)
-''')
-
-c.execute('''
-CREATE TABLE IF NOT EXISTS subject_performance (
-    username TEXT,
-    subject TEXT,
-    correct INTEGER,
-    total INTEGER,
-    timestamp DATETIME
-)
-''')
-
-c.execute('''
-CREATE TABLE IF NOT EXISTS quiz_results (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    user_id TEXT,
-    subject TEXT,
-    score_percent REAL,
-    date TEXT,
-    category_name TEXT
-)
-''')
+# Tables and indexes come from the app's migrations so both stay in sync
+migrate(conn)
 
 # ---------------------------
 # Helper function for Hashing
@@ -160,7 +113,7 @@ performance = [
 ]
 
 c.executemany(
-    "INSERT INTO subject_performance VALUES (?, ?, ?, ?, ?)",
+    "INSERT OR IGNORE INTO subject_performance VALUES (?, ?, ?, ?, ?)",
     performance
 )
 
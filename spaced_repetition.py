@@ -0,0 +1,64 @@
+"""
+spaced_repetition.py
+--------------------
+SM-2 style review scheduling. Every (user, question) pair answered in a quiz gets an interval
+and a due date in review_schedule; the "Review Due" button pulls the earliest due questions
+with one range scan on the (username, due_at) index.
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+# A missed question comes back after this long
+RELEARN_MINUTES = 10
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+UPSERT_REVIEW = """
+    INSERT INTO review_schedule (username, question_id, reps, interval_days, ease, due_at, last_review)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (username, question_id) DO UPDATE SET
+        reps = excluded.reps,
+        interval_days = excluded.interval_days,
+        ease = excluded.ease,
+        due_at = excluded.due_at,
+        last_review = excluded.last_review
+"""
+
+
+def next_intervals(reps, interval_days, ease, correct):
+    """Vectorized SM-2 step with a pass/fail grade. Returns new (reps, interval_days, ease)."""
+    reps = np.where(correct, reps + 1, 0)
+    # 1 day after the first success, 6 after the second, then the interval grows by the ease factor
+    grown = np.where(reps == 1, 1.0, np.where(reps == 2, 6.0, interval_days * ease))
+    interval_days = np.where(correct, grown, 0.0)
+    ease = np.clip(np.where(correct, ease + 0.1, ease - 0.2), MIN_EASE, None)
+    return reps, interval_days, ease
+
+
+def update_review_schedule(conn, username, question_ids, correct, now=None):
+    """Reschedules one quiz's questions in a single read and a single executemany (runs inside the caller's transaction)."""
+    now = now or datetime.now()
+    question_ids = [int(q) for q in question_ids]
+    if not question_ids:
+        return
+    # 1. Current state of these questions, one IN (...) lookup on the primary key
+    state = {}
+    for start in range(0, len(question_ids), 500):
+        chunk = question_ids[start:start + 500]
+        rows = conn.execute(f"""
+            SELECT question_id, reps, interval_days, ease FROM review_schedule
+            WHERE username = ? AND question_id IN ({','.join('?' * len(chunk))})
+        """, [username, *chunk]).fetchall()
+        state.update({row[0]: row[1:] for row in rows})
+    current = np.array([state.get(q, (0, 0.0, DEFAULT_EASE)) for q in question_ids], dtype=np.float64).reshape(-1, 3)
+    # 2. New intervals for the whole quiz at once
+    reps, interval_days, ease = next_intervals(current[:, 0], current[:, 1], current[:, 2], np.asarray(correct, dtype=bool))
+    # 3. Write them back in one batch
+    stamp = now.strftime(TIME_FORMAT)
+    rows = []
+    for q, r, d, e in zip(question_ids, reps, interval_days, ease):
+        delay = timedelta(days=float(d)) if d > 0 else timedelta(minutes=RELEARN_MINUTES)
+        rows.append((username, q, int(r), round(float(d), 3), round(float(e), 3), (now + delay).strftime(TIME_FORMAT), stamp))
+    conn.executemany(UPSERT_REVIEW, rows)
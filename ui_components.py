@@ -1,9 +1,8 @@
 import customtkinter as ctk
 from tkinter import messagebox
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
 import sqlite3
 from database_manager import *
+from progress_analytics import RANGES
 
 class WelcomeFrame(ctk.CTkFrame):
     def __init__(self, master, auth_callback, **kwargs):
@@ -23,6 +22,14 @@ class WelcomeFrame(ctk.CTkFrame):
                       command=lambda: auth_callback("register")).pack(pady=10, padx=40)
         
 
+class LoadingFrame(ctk.CTkFrame):
+    """Placeholder shown straight away while a screen's data loads in the background."""
+    def __init__(self, master, text="Loading...", **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        ctk.CTkLabel(self, text=text, font=("Segoe UI", 20, "italic"), 
+                     text_color="gray").pack(expand=True)
+
+
 class AuthFrame(ctk.CTkFrame):
     def __init__(self, master, mode, login_cmd, register_cmd, back_cmd, win_width, **kwargs):
         # We put the main content inside a frame which sits inside the scrollable master
@@ -51,17 +58,18 @@ class AuthFrame(ctk.CTkFrame):
     
 
 class DashboardFrame(ctk.CTkFrame):
-    def __init__(self, master, is_admin, categories, subjects_df, commands, subjects, user_name="User", **kwargs):
+    def __init__(self, master, is_admin, categories, subjects_by_category, commands, subjects, user_name="User", **kwargs):
         self.win_width = kwargs.pop('win_width', None)
         # Extract the real database stats passed from main.py
         self.stats_data = kwargs.pop('stats_data', {'total_quizzes': 0, 'avg_score': 0, 'best_subject': 'N/A', 'recent_activity': []})
         super().__init__(master, fg_color="transparent", **kwargs)
-        # This is your database (self.full_df from main.py)
+        # Subjects per category, precomputed by the question index in main.py
         self.is_admin = is_admin
-        self.full_df = subjects_df 
+        self.subjects_by_category = subjects_by_category 
         self.subjects_list = subjects 
         self.commands = commands
         self.user_name = user_name
+        self.categories = categories
 
         # --- SIDEBAR ---
         self.sidebar = ctk.CTkFrame(self, width=220, corner_radius=35, fg_color=("#EBF5FF", "#333333")) 
@@ -134,7 +142,7 @@ class DashboardFrame(ctk.CTkFrame):
         self.mode_desc_var = ctk.StringVar(value="Standard: 60s per question.")
         mode_f = ctk.CTkFrame(self.config_card, fg_color="transparent")
         mode_f.pack(pady=2)
-        for m_text, m_val in [("Standard", "Standard"), ("Sudden Death", "Death"), ("Speed Sprint", "Sprint")]:
+        for m_text, m_val in [("Standard", "Standard"), ("Sudden Death", "Death"), ("Speed Sprint", "Sprint"), ("Adaptive", "Adaptive")]:
             ctk.CTkRadioButton(mode_f, text=m_text, variable=self.mode_var, value=m_val, 
                                command=self.update_mode_description,
                                font=("Segoe UI", 10), radiobutton_width=18, radiobutton_height=18).pack(side="left", padx=5)
@@ -142,7 +150,13 @@ class DashboardFrame(ctk.CTkFrame):
             # 5. Start Quiz Button
         self.start_btn = ctk.CTkButton(self.config_card, text="START QUIZ", font=("Segoe UI", 16, "bold"), 
                                       width=300, height=42, corner_radius=15, command=commands['start'])
-        self.start_btn.pack(side="bottom", pady=20)
+        self.start_btn.pack(side="bottom", pady=(5, 20))
+            # 6. Spaced-repetition review of the questions that are due
+        due = self.stats_data.get('due_reviews', 0)
+        self.review_btn = ctk.CTkButton(self.config_card, text=f"REVIEW DUE ({due})", font=("Segoe UI", 13, "bold"),
+                                        width=300, height=34, corner_radius=15, fg_color="#8E44AD", hover_color="#6C3483",
+                                        state="normal" if due else "disabled", command=commands['review'])
+        self.review_btn.pack(side="bottom", pady=(5, 0))
 
         # --- RIGHT PANEL ---
         right_panel = ctk.CTkFrame(bottom_area, fg_color="transparent")
@@ -155,63 +169,23 @@ class DashboardFrame(ctk.CTkFrame):
         # Stats Row - Using real data keys
         stats_f = ctk.CTkFrame(stats_card, fg_color="transparent")
         stats_f.pack(fill="x", padx=20, pady=10)
-        # Mapping stats from your database dictionary
-        real_stats = [
-            ("Quizzes", str(self.stats_data['total_quizzes']), "#4CAF50"),
-            ("Avg Score", f"{self.stats_data['avg_score']}%", "#007AFF"),
-            ("Category", "Overall", "#FF9800")
-        ]
-        # Determine color: use provided 'col' unless it's the Avg Score
-        for label, val, col in real_stats:
-            display_col = col
-            if label == "Avg Score":
-                clean_val = val.replace('%', '')
-                display_col = self.get_score_color(clean_val)
-        # for label, val, col in real_stats:
+        # Mapping stats from your database dictionary; the value labels are kept so update_stats() can patch them
+        self.stat_labels = {}
+        for label, col in [("Quizzes", "#4CAF50"), ("Avg Score", "#007AFF"), ("Category", "#FF9800")]:
             f = ctk.CTkFrame(stats_f, fg_color="transparent")
             f.pack(side="left", expand=True)
-            ctk.CTkLabel(f, text=val, font=("Segoe UI", 20, "bold"), text_color=display_col).pack()
+            self.stat_labels[label] = ctk.CTkLabel(f, text="Overall", font=("Segoe UI", 20, "bold"), text_color=col)
+            self.stat_labels[label].pack()
             ctk.CTkLabel(f, text=label, font=("Segoe UI", 10)).pack()
 
            # 2. Recent Activity Card
         activity_card = ctk.CTkFrame(right_panel, fg_color=("#EBF5FF", "#333333"), corner_radius=25)
         activity_card.pack(fill="both", expand=True)
         ctk.CTkLabel(activity_card, text="Recent Activity", font=("Segoe UI", 18, "bold"), text_color=("#007AFF", "#3B8ED0")).pack(pady=10)
-        # Using real activity list from database
-        user_activities = self.stats_data['recent_activity']
-        if not user_activities:
-            ctk.CTkLabel(activity_card, text="No quizzes taken yet!", font=("Segoe UI", 12, "italic")).pack(pady=20)
-        else:
-            for row in user_activities:
-                current_cat = row[0]
-                current_score = row[1]
-                current_date = row[2]
-                item = ctk.CTkFrame(activity_card, fg_color="transparent")
-                item.pack(fill="x", padx=20, pady=5)
-                # Logic to find which part of the row is the score and which is the date
-                current_score = 0.0
-                current_date = "Recent"
-                current_cat = "Quiz"
-                
-                for val in row:
-                    val_str = str(val)
-                    if '-' in val_str and ':' in val_str: # It's the date/timestamp
-                        try:
-                            date_obj = datetime.strptime(val_str.split('.')[0], '%Y-%m-%d %H:%M:%S')
-                            current_date = date_obj.strftime('%d %b')
-                        except: current_date = val_str[:10]
-                    elif isinstance(val, (int, float)) or (val_str.replace('.','',1).isdigit()): # It's the score
-                        current_score = float(val)
-                    else: # It's the Category/Subject
-                        current_cat = val_str
-
-                #  Dynamic Label for date and category like: "31 Jan - MDCAT"
-                display_text = f"{current_date} - {current_cat}"
-                ctk.CTkLabel(item, text=display_text, font=("Segoe UI", 12)).pack(side="left")
-                
-                # Safe Rounded Score
-                ctk.CTkLabel(item, text=f"{current_score:.1f}%", font=("Segoe UI", 12, "bold"), text_color="#4CAF50").pack(side="right")
-                ctk.CTkFrame(activity_card, height=1, fg_color=("#D1E9FF", "#4D4D4D")).pack(fill="x", padx=30, pady=2)
+        # Rows go in their own frame so they can be replaced without touching the rest of the card
+        self.activity_list = ctk.CTkFrame(activity_card, fg_color="transparent")
+        self.activity_list.pack(fill="x")
+        self.update_stats(self.stats_data)
 
         # Clear History Button Logic
         self.clear_history_btn = ctk.CTkButton(
@@ -226,11 +200,73 @@ class DashboardFrame(ctk.CTkFrame):
         )
         self.clear_history_btn.pack(pady=20, padx=20)
 
+    def update_stats(self, stats_data):
+        """Patches Quick Stats, Recent Activity and the review count in place (the rest of the frame is reused)."""
+        self.stats_data = stats_data
+        self.stat_labels["Quizzes"].configure(text=str(stats_data['total_quizzes']))
+        # Determine color: the Avg Score is colored by its value
+        self.stat_labels["Avg Score"].configure(text=f"{stats_data['avg_score']}%",
+                                                text_color=self.get_score_color(stats_data['avg_score']))
+        self.update_due_reviews(stats_data.get('due_reviews', 0))
+        for widget in self.activity_list.winfo_children():
+            widget.destroy()
+        # Using real activity list from database
+        user_activities = stats_data['recent_activity']
+        if not user_activities:
+            ctk.CTkLabel(self.activity_list, text="No quizzes taken yet!", font=("Segoe UI", 12, "italic")).pack(pady=20)
+            return
+        for row in user_activities:
+            item = ctk.CTkFrame(self.activity_list, fg_color="transparent")
+            item.pack(fill="x", padx=20, pady=5)
+            # Logic to find which part of the row is the score and which is the date
+            current_score = 0.0
+            current_date = "Recent"
+            current_cat = "Quiz"
+            
+            for val in row:
+                val_str = str(val)
+                if '-' in val_str and ':' in val_str: # It's the date/timestamp
+                    try:
+                        date_obj = datetime.strptime(val_str.split('.')[0], '%Y-%m-%d %H:%M:%S')
+                        current_date = date_obj.strftime('%d %b')
+                    except: current_date = val_str[:10]
+                elif isinstance(val, (int, float)) or (val_str.replace('.','',1).isdigit()): # It's the score
+                    current_score = float(val)
+                else: # It's the Category/Subject
+                    current_cat = val_str
+
+            #  Dynamic Label for date and category like: "31 Jan - MDCAT"
+            display_text = f"{current_date} - {current_cat}"
+            ctk.CTkLabel(item, text=display_text, font=("Segoe UI", 12)).pack(side="left")
+            
+            # Safe Rounded Score
+            ctk.CTkLabel(item, text=f"{current_score:.1f}%", font=("Segoe UI", 12, "bold"), text_color="#4CAF50").pack(side="right")
+            ctk.CTkFrame(self.activity_list, height=1, fg_color=("#D1E9FF", "#4D4D4D")).pack(fill="x", padx=30, pady=2)
+
+    def update_due_reviews(self, due):
+        self.stats_data['due_reviews'] = due
+        self.review_btn.configure(text=f"REVIEW DUE ({due})", state="normal" if due else "disabled")
+
+    def update_categories(self, categories, subjects_by_category, subjects):
+        """New question bank version: refreshes the category menu, and the subject list if it changed."""
+        self.categories = categories
+        self.subjects_list = subjects
+        self.cat_cb.configure(values=categories)
+        current = self.cat_cb.get()
+        if current != "Select Category" and current not in categories:
+            self.cat_cb.set("Select Category")
+            current = "Select Category"
+        if subjects_by_category.get(current) != self.subjects_by_category.get(current):
+            self.subjects_by_category = subjects_by_category
+            self.update_subjects(current)
+        self.subjects_by_category = subjects_by_category
+
     def update_mode_description(self):
         modes = {
             "Standard": "Standard: 60s per question.",
             "Death": "Sudden Death: One wrong answer and it's over!",
-            "Sprint": "Speed Sprint: 10 seconds per question!"
+            "Sprint": "Speed Sprint: 10 seconds per question!",
+            "Adaptive": "Adaptive: more of the questions you miss or haven't seen lately."
         }
         self.mode_desc_var.set(modes.get(self.mode_var.get()))
 
@@ -258,7 +294,7 @@ class DashboardFrame(ctk.CTkFrame):
 
     def perform_deletion(self):
         try:
-            with sqlite3.connect('prepify.db') as conn:
+            with transaction() as conn:
                 cursor = conn.cursor()
                 # 1. Clear Quiz Stats & History
                 cursor.execute("DELETE FROM quiz_results WHERE user_id = ?", (self.user_name,))
@@ -268,7 +304,10 @@ class DashboardFrame(ctk.CTkFrame):
                     cursor.execute("DELETE FROM quiz_history WHERE username = ?", (self.user_name,))
                 # 2. Clear performance table
                 cursor.execute("DELETE FROM subject_performance WHERE username = ?", (self.user_name,))
-                conn.commit()
+                cursor.execute("DELETE FROM question_attempts WHERE username = ?", (self.user_name,))
+                cursor.execute("DELETE FROM quiz_sessions WHERE username = ?", (self.user_name,))
+                cursor.execute("DELETE FROM user_question_stats WHERE username = ?", (self.user_name,))
+                cursor.execute("DELETE FROM review_schedule WHERE username = ?", (self.user_name,))
                 # 3. Refresh the UI
             if 'dash_cmd' in self.commands:
                 self.commands['dash_cmd'](self.is_admin, self.user_name)
@@ -285,7 +324,7 @@ class DashboardFrame(ctk.CTkFrame):
             ctk.CTkLabel(self.sub_frame, text="Select a category to load subjects", font=("Segoe UI", 11, "italic")).pack(pady=10)
             return
         
-        filtered_subjects = self.full_df[self.full_df['Category'] == selected_category]['Subject'].unique().tolist()
+        filtered_subjects = self.subjects_by_category.get(selected_category, [])
         for s in filtered_subjects:
             var = ctk.BooleanVar()
             self.subject_vars[s] = var
@@ -299,8 +338,12 @@ class DashboardFrame(ctk.CTkFrame):
              
 
 class QuizFrame(ctk.CTkFrame):
-    def __init__(self, master, current_q, total_q, question_data, saved_answer, next_cmd, prev_cmd, **kwargs):
+    """The quiz screen. Widgets are built once per quiz; show_question() swaps in another question."""
+
+    def __init__(self, master, total_q, next_cmd, prev_cmd, **kwargs):
         super().__init__(master, fg_color="transparent", **kwargs)
+        self.total_q = total_q
+        self.current_q = None
         # 1. Centered Red Timer Label
         self.timer_label = ctk.CTkLabel(self, text="", font=("Segoe UI", 24, "bold"), text_color="#E91E63")
         self.timer_label.pack(pady=(20, 10))
@@ -310,33 +353,53 @@ class QuizFrame(ctk.CTkFrame):
         self.card.pack(expand=True, fill="both", padx=40, pady=20)
         
         # 3. Question Counter
-        counter_text = f"Question {current_q + 1} of {total_q}"
-        ctk.CTkLabel(self.card, text=counter_text, font=("Segoe UI", 16)).pack(pady=(20, 0))
+        self.counter_label = ctk.CTkLabel(self.card, text="", font=("Segoe UI", 16))
+        self.counter_label.pack(pady=(20, 0))
         
         # 4. Question Text
-        self.question_label = ctk.CTkLabel(self.card, text=question_data['Question'], 
+        self.question_label = ctk.CTkLabel(self.card, text="", 
                                            font=("Segoe UI", 26, "bold"), wraplength=900)
         self.question_label.pack(pady=30)
         
-        # 5. Radio Buttons for Options
-        self.opt_var = ctk.StringVar(value=saved_answer)
+        # 5. Radio Buttons for Options (text and value are replaced per question)
+        self.opt_var = ctk.StringVar(value="None")
+        self.option_buttons = []
         for i in range(1, 5):
-            ctk.CTkRadioButton(self.card, text=str(question_data[f'Option{i}']), 
-                               value=str(question_data[f'Option{i}']), 
-                               variable=self.opt_var,
-                               font=("Segoe UI", 14),
-                               border_width_checked=6).pack(pady=10, anchor="w", padx=100)
+            rb = ctk.CTkRadioButton(self.card, text="", value="", 
+                                    variable=self.opt_var,
+                                    font=("Segoe UI", 14),
+                                    border_width_checked=6)
+            rb.pack(pady=10, anchor="w", padx=100)
+            self.option_buttons.append(rb)
         
         # 6. Navigation Footer
         footer = ctk.CTkFrame(self, fg_color="transparent")
         footer.pack(fill="x", side="bottom", pady=30)
-        btn_next_text = "Finish" if current_q == total_q - 1 else "Next ➡"
-        ctk.CTkButton(footer, text=btn_next_text, width=150, height=40, font=("Segoe UI", 14, "bold"),
-                      command=next_cmd).pack(side="right", padx=60)
-        
-        if current_q > 0: 
-            ctk.CTkButton(footer, text="⬅ Back", width=150, height=40, font=("Segoe UI", 14, "bold"),
-                          command=prev_cmd).pack(side="left", padx=60)
+        self.next_btn = ctk.CTkButton(footer, text="Next ➡", width=150, height=40, font=("Segoe UI", 14, "bold"),
+                                      command=next_cmd)
+        self.next_btn.pack(side="right", padx=60)
+        self.back_btn = ctk.CTkButton(footer, text="⬅ Back", width=150, height=40, font=("Segoe UI", 14, "bold"),
+                                      command=prev_cmd)
+        self.back_visible = False
+
+    def show_question(self, current_q, record, saved_answer):
+        """Updates text, radio values and buttons in place for question current_q (record: dict with Question/Option1-4)."""
+        self.current_q = current_q
+        self.counter_label.configure(text=f"Question {current_q + 1} of {self.total_q}")
+        self.question_label.configure(text=record['Question'])
+        for i, rb in enumerate(self.option_buttons, start=1):
+            option = str(record[f'Option{i}'])
+            rb.configure(text=option, value=option)
+        # Setting the variable re-checks the matching radio button (or clears them all)
+        self.opt_var.set(saved_answer)
+        self.next_btn.configure(text="Finish" if current_q == self.total_q - 1 else "Next ➡")
+        # Back button only from the second question on
+        if current_q > 0 and not self.back_visible:
+            self.back_btn.pack(side="left", padx=60)
+            self.back_visible = True
+        elif current_q == 0 and self.back_visible:
+            self.back_btn.pack_forget()
+            self.back_visible = False
             
 
 class ResultsFrame(ctk.CTkFrame):
@@ -353,20 +416,14 @@ class ResultsFrame(ctk.CTkFrame):
         card.pack(pady=10, padx=40, fill="both", expand=True)
         
         # 3. Final Score Label 
-        score_text = f"Final Score: {last_score} / {last_total}"
-        ctk.CTkLabel(card, text=score_text, 
-                     font=("Segoe UI", 28)).pack(pady=(20, 0))
+        self.score_lbl = ctk.CTkLabel(card, text="", font=("Segoe UI", 28))
+        self.score_lbl.pack(pady=(20, 0))
 
         # 4. Pie Chart Container
-        chart_container = ctk.CTkFrame(card, fg_color=card_color) 
-        chart_container.pack(expand=True, fill="both", pady=0)
-
-        # Call the generator from the report module
-        chart = report_module.generate_pie_chart(chart_container, last_score, last_total, ctk.get_appearance_mode())
-        
-        chart_widget = chart.get_tk_widget()
-        chart_widget.pack(expand=True, fill="both")
-        chart.draw()
+        self.chart_container = ctk.CTkFrame(card, fg_color=card_color) 
+        self.chart_container.pack(expand=True, fill="both", pady=0)
+        self.report_module = report_module
+        self.show_score(last_score, last_total)
         
         # 5. Bottom Navigation Buttons 
         btn_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -379,10 +436,19 @@ class ResultsFrame(ctk.CTkFrame):
         ctk.CTkButton(btn_frame, text="Go to Dashboard", 
                        width=220, height=45, font=("Segoe UI", 14, "bold"),
                        command=dash_cmd, fg_color="gray", hover_color="#555555").pack(pady=5)
+
+    def show_score(self, last_score, last_total):
+        """Updates the score and the pie in place, so one frame serves every finished quiz."""
+        self.score_lbl.configure(text=f"Final Score: {last_score} / {last_total}")
+        # Call the generator from the report module (it redraws the pooled pie chart)
+        chart = self.report_module.generate_pie_chart(self.chart_container, last_score, last_total, ctk.get_appearance_mode())
+        chart_widget = chart.get_tk_widget()
+        if not chart_widget.winfo_manager():
+            chart_widget.pack(expand=True, fill="both")
         
 
 class ReviewFrame(ctk.CTkFrame):
-    def __init__(self, master, quiz_data, answers, back_cmd, save_cmd, **kwargs):
+    def __init__(self, master, quiz_data, answers, back_cmd, save_cmd, quiz_score=None, **kwargs):
         super().__init__(master, fg_color="transparent", **kwargs)
         # Header with Save PDF and Back buttons
         header = ctk.CTkFrame(self, height=70, fg_color="transparent")
@@ -395,14 +461,17 @@ class ReviewFrame(ctk.CTkFrame):
         scroll = ctk.CTkScrollableFrame(self)
         scroll.pack(fill="both", expand=True, padx=40, pady=10)
         
-        for i, q in quiz_data.iterrows():
+        if quiz_score is None:
+            from scoring import QuizScore
+            quiz_score = QuizScore(quiz_data, answers)
+        for pos, (i, q) in enumerate(quiz_data.iterrows()):
             # Question Container
             f = ctk.CTkFrame(scroll, fg_color="transparent")
             f.pack(fill="x", pady=5)
             
             u_ans = answers.get(i, "None")
             cor_ans = str(q['Answer'])
-            is_correct = str(u_ans) == cor_ans
+            is_correct = quiz_score.is_correct(pos)
             
             # Question Text
             ctk.CTkLabel(f, text=f"Q{i+1}: {q['Question']}", 
@@ -466,23 +535,33 @@ class UserManagementFrame(ctk.CTkFrame):
         ctk.CTkButton(header, text="⬅ BACK", width=100, fg_color="#3498db", 
                       command=commands['back']).pack(side="left", padx=(0, 20))
         
-        search_entry = ctk.CTkEntry(header, placeholder_text="Search users...", width=250)
+        self.search_var = ctk.StringVar(value=search_query)
+        search_entry = ctk.CTkEntry(header, placeholder_text="Search users...", width=250, textvariable=self.search_var)
         search_entry.pack(side="left", padx=5)
-        
-        if search_query: 
-            search_entry.insert(0, search_query)
+        # Live search: every keystroke goes to the debounced background search
+        self.search_var.trace_add("write", lambda *args: commands['search'](self.search_var.get()))
             
         ctk.CTkButton(header, text="🔍 SEARCH", width=80, 
-                      command=lambda: commands['search'](search_entry.get())).pack(side="left", padx=5)
+                      command=lambda: commands['search'](self.search_var.get(), True)).pack(side="left", padx=5)
         
         ctk.CTkButton(header, text="➕ ADD NEW ADMIN", fg_color="#4CAF50", hover_color="#388E3C", 
                       command=commands['add_admin']).pack(side="right")
         
-        container = ctk.CTkScrollableFrame(main_frame, label_text="REGISTERED USERS")
-        container.pack(expand=True, fill="both")
+        self.commands = commands
+        self.container = ctk.CTkScrollableFrame(main_frame, label_text="REGISTERED USERS")
+        self.container.pack(expand=True, fill="both")
+        self.show_users(users_list)
+
+    def show_users(self, users_list):
+        """Replaces the listed users (called with the results of each search)."""
+        if not self.winfo_exists():
+            return
+        commands = self.commands
+        for widget in self.container.winfo_children():
+            widget.destroy()
 
         for username, is_admin in users_list:
-            row_frame = ctk.CTkFrame(container)
+            row_frame = ctk.CTkFrame(self.container)
             row_frame.pack(fill="x", padx=10, pady=5)
             
             status_text = " [ADMIN]" if is_admin else ""
@@ -499,7 +578,7 @@ class UserManagementFrame(ctk.CTkFrame):
             
 
 class ManageQuestionsFrame(ctk.CTkFrame):
-    def __init__(self, master, back_cmd, refresh_cmd, **kwargs):
+    def __init__(self, master, back_cmd, refresh_cmd, edit_cmd, delete_cmd, **kwargs):
         super().__init__(master, fg_color="transparent", **kwargs)
         # 1. Top Bar
         top_bar = ctk.CTkFrame(self, height=80)
@@ -517,13 +596,13 @@ class ManageQuestionsFrame(ctk.CTkFrame):
         search_container.pack(side="right", padx=30)
         self.search_var = ctk.StringVar()
         # The trace calls the refresh command whenever the user types
-        self.search_var.trace_add("write", lambda *args: refresh_cmd(self.container, self.search_var.get()))
+        self.search_var.trace_add("write", lambda *args: refresh_cmd(self.search_var.get()))
         search_ent = ctk.CTkEntry(search_container, placeholder_text="🔍 Search questions...", 
                                   width=400, height=40, textvariable=self.search_var)
         search_ent.pack(side="left", padx=(0, 10))
         
-        # 3. List Container
-        self.container = ctk.CTkScrollableFrame(self, width=1200, height=700)
+        # 3. List Container (only the visible cards exist, they are reused while scrolling)
+        self.container = VirtualQuestionList(self, edit_cmd=edit_cmd, delete_cmd=delete_cmd, width=1200, height=700)
         self.container.pack(side="top", fill="both", expand=True, padx=20, pady=(0, 20))
 
 
@@ -650,41 +729,56 @@ class AddQuestionFrame(ctk.CTkFrame):
 
 
 class ProgressFrame(ctk.CTkFrame):
-    def __init__(self, master, progress_df, back_cmd, **kwargs):
+    def __init__(self, master, progress, back_cmd, range_cmd=None, days=None, **kwargs):
         super().__init__(master, fg_color="transparent", **kwargs)
         
         ctk.CTkButton(self, text="⬅ BACK", command=back_cmd).pack(pady=10)
         ctk.CTkLabel(self, text="PERFORMANCE GRAPH", font=("Segoe UI", 32, "bold"), text_color="#3B8ED0").pack(pady=20)
-        
-        container = ctk.CTkFrame(self, corner_radius=20)
-        container.pack(fill="both", expand=True, padx=20, pady=20)
-        
-        if progress_df is not None and not progress_df.empty:
-            try:
-                # Reverse to get chronological order (oldest to newest)
-                df = progress_df.iloc[::-1].copy() 
-                
-                fig, ax = plt.subplots(figsize=(8, 4), dpi=100)
-                fig.patch.set_alpha(0.0) 
-                
-                # Use number of quizzes for the x-axis
-                # This prevents the vertical line "n" issue
-                x_values = list(range(1, len(df) + 1))
-                ax.plot(x_values, df['percentage'], marker='o', color='#3B8ED0', linewidth=3)
-                
-                ax.set_ylim(0, 105)
-                ax.set_xticks(x_values) # Show 1, 2, 3... on the bottom
-                ax.set_xlabel("Quiz Number")
-                ax.set_ylabel("Score %")
-                ax.grid(True, linestyle='--', alpha=0.6)
-                
-                canvas = FigureCanvasTkAgg(fig, master=container)
-                canvas.draw()
-                canvas.get_tk_widget().pack(fill="both", expand=True)
-            except:
-                pass
-        else:
-            ctk.CTkLabel(container, text="No quiz history yet. Take a quiz to see progress!").pack(expand=True)
+
+        # Zoom: every range is downsampled to the same number of points (see progress_analytics.py)
+        labels = {d: label for label, d in RANGES.items()}
+        self.range_btn = ctk.CTkSegmentedButton(self, values=list(RANGES),
+                                                command=lambda label: range_cmd(RANGES[label]) if range_cmd else None)
+        self.range_btn.set(labels.get(days, "All"))
+        self.range_btn.pack(pady=(0, 5))
+        self.stats_lbl = ctk.CTkLabel(self, text="", font=("Segoe UI", 14))
+        self.stats_lbl.pack()
+        
+        self.container = ctk.CTkFrame(self, corner_radius=20)
+        self.container.pack(fill="both", expand=True, padx=20, pady=20)
+        self.empty_lbl = ctk.CTkLabel(self.container, text="No quiz history yet. Take a quiz to see progress!")
+        self.chart = None
+        self.show_progress(progress)
+
+    def show_progress(self, progress):
+        """Puts a get_progress_analytics() result on the pooled line chart (see chart_service.py); the frame is kept between visits."""
+        if not progress or not progress["count"]:
+            if self.chart is not None:
+                self.chart.canvas.get_tk_widget().pack_forget()
+            self.stats_lbl.configure(text="")
+            self.empty_lbl.configure(text="No quizzes in this period." if progress and progress["days"]
+                                     else "No quiz history yet. Take a quiz to see progress!")
+            self.empty_lbl.pack(expand=True)
+            return
+        self.empty_lbl.pack_forget()
+        trend = progress["slope_per_week"]
+        trend_text = f"  |  Trend: {trend:+.1f} pts/week" if trend is not None else ""
+        self.stats_lbl.configure(text=f"{progress['count']} quizzes  |  Average: {progress['average']:.1f}%{trend_text}")
+        try:
+            # matplotlib is only loaded once a chart is actually shown
+            from chart_service import LineChart, get_chart
+            self.chart = get_chart("progress", self.container, LineChart)
+            # Quiz numbers on the x-axis (oldest to newest)
+            # This prevents the vertical line "n" issue
+            series, band = progress["series"], progress["band"]
+            downsampled = progress["count"] > len(series)
+            self.chart.set_data(series['quiz_no'], series['percentage'], rolling=series['rolling'],
+                                band=(band['quiz_no'], band['low'], band['high']) if downsampled else None)
+            widget = self.chart.canvas.get_tk_widget()
+            if not widget.winfo_manager():
+                widget.pack(fill="both", expand=True)
+        except Exception as e:
+            print(f"Chart Error: {e}")
 
 
 class WeakSubjectFrame(ctk.CTkFrame):
@@ -720,58 +814,193 @@ class WeakSubjectFrame(ctk.CTkFrame):
             ctk.CTkLabel(card, text="Not enough data yet. Complete more quizzes!").pack(expand=True)
 
 
-class RefreshableQuestionCard:
-    @staticmethod
-    def create_question_card(parent, container, row):
-        # Safety Check: If the container is destroyed, stop immediately
-        if not container or not container.winfo_exists():
-            return
+class RefreshableQuestionCard(ctk.CTkFrame):
+    """One recyclable question card. The widgets are built once, bind_row() swaps in a new question."""
+    HEIGHT = 190
+
+    def __init__(self, master, edit_cmd, delete_cmd, wraplength=600, **kwargs):
+        super().__init__(master, height=self.HEIGHT, border_width=2, border_color="#3498db", **kwargs)
+        self.pack_propagate(False)
+        self.row = None
 
-        # Unpack the row data
-        r_id, ques, o1, o2, o3, o4, ans, cat, sub = row
-        
-        # Build the row frame with a blue border
-        f = ctk.CTkFrame(container, border_width=2, border_color="#3498db")
-        f.pack(fill="x", pady=10, padx=20)
-        
         # Content Container
-        content = ctk.CTkFrame(f, fg_color="transparent")
+        content = ctk.CTkFrame(self, fg_color="transparent")
         content.pack(side="left", fill="both", expand=True, padx=20, pady=10)
 
         # Header: ID | Category | Subject 
-        header_text = f"ID: {r_id} | {cat} | {sub}"
-        ctk.CTkLabel(content, text=header_text, font=("Segoe UI", 13, "bold"), 
-                     text_color="#3498db").pack(anchor="w")
+        self.header_lbl = ctk.CTkLabel(content, text="", font=("Segoe UI", 13, "bold"), text_color="#3498db")
+        self.header_lbl.pack(anchor="w")
 
         # Question Text
-        # Safety check for winfo_width() to prevent Tcl errors during rapid refreshes
-        try:
-            current_width = parent.root.winfo_width()
-            wrap_val = current_width - 300 if current_width > 300 else 600
-        except:
-            wrap_val = 600
-
-        ctk.CTkLabel(content, text=f"Q: {ques}", font=("Segoe UI", 16, "bold"), 
-                     wraplength=max(wrap_val, 600), justify="left").pack(anchor="w", pady=(10, 5))
+        self.question_lbl = ctk.CTkLabel(content, text="", font=("Segoe UI", 16, "bold"),
+                                         wraplength=wraplength, justify="left")
+        self.question_lbl.pack(anchor="w", pady=(10, 5))
 
         # Options
-        options_text = f"  1) {o1}  2) {o2}  3) {o3}  4) {o4}"
-        ctk.CTkLabel(content, text=options_text, font=("Segoe UI", 12), 
-                     text_color="gray", wraplength=max(wrap_val, 600)).pack(anchor="w")
+        self.options_lbl = ctk.CTkLabel(content, text="", font=("Segoe UI", 12),
+                                        text_color="gray", wraplength=wraplength)
+        self.options_lbl.pack(anchor="w")
 
         # Correct Answer
-        ctk.CTkLabel(content, text=f"Answer: {ans}", font=("Segoe UI", 13, "bold"), 
-                     text_color="green").pack(anchor="w", pady=(10, 0))
-        
-        # Action Buttons Frame
-        btn_frame = ctk.CTkFrame(f, fg_color="transparent")
+        self.answer_lbl = ctk.CTkLabel(content, text="", font=("Segoe UI", 13, "bold"), text_color="green")
+        self.answer_lbl.pack(anchor="w", pady=(10, 0))
+
+        # Item statistics (difficulty, discrimination, option picks) from item_analysis.py
+        self.stats_lbl = ctk.CTkLabel(content, text="", font=("Segoe UI", 11), text_color="gray")
+        self.stats_lbl.pack(anchor="w")
+
+        # Action Buttons Frame (they always act on whatever row is currently bound)
+        btn_frame = ctk.CTkFrame(self, fg_color="transparent")
         btn_frame.pack(side="right", padx=20, pady=10, anchor="s")
-        
-        # Use the exact row_map structure your old code used
-        row_map = (r_id, cat, sub, ques, o1, o2, o3, o4, ans)
-        
-        ctk.CTkButton(btn_frame, text="EDIT", width=100, fg_color="#3498db", 
-                      command=lambda r=row_map: parent.show_edit_question_page(r)).pack(side="left", padx=5)
-        
-        ctk.CTkButton(btn_frame, text="DELETE", width=100, fg_color="#E91E63", 
-                      command=lambda i=r_id: parent.delete_logic(i)).pack(side="left", padx=5)
\ No newline at end of file
+        ctk.CTkButton(btn_frame, text="EDIT", width=100, fg_color="#3498db",
+                      command=lambda: self.row and edit_cmd(self.row_map())).pack(side="left", padx=5)
+        ctk.CTkButton(btn_frame, text="DELETE", width=100, fg_color="#E91E63",
+                      command=lambda: self.row and delete_cmd(self.row[0])).pack(side="left", padx=5)
+
+    def bind_row(self, row):
+        """Shows another question in this card by updating label text only."""
+        if row == self.row:
+            return
+        self.row = row
+        r_id, ques, o1, o2, o3, o4, ans, cat, sub = row[:9]
+        self.header_lbl.configure(text=f"ID: {r_id} | {cat} | {sub}")
+        self.question_lbl.configure(text=f"Q: {ques}")
+        self.options_lbl.configure(text=f"  1) {o1}  2) {o2}  3) {o3}  4) {o4}")
+        self.answer_lbl.configure(text=f"Answer: {ans}")
+        self.stats_lbl.configure(text=self.stats_text(row[9:]))
+
+    @staticmethod
+    def stats_text(stats):
+        if not stats or not stats[0]:
+            return "Stats: no attempts yet"
+        attempts, p_value, disc = stats[:3]
+        picks = "  ".join(f"{i}) {r * 100:.0f}%" for i, r in enumerate(stats[3:], start=1) if r is not None)
+        disc_text = "n/a" if disc is None else f"{disc:.2f}"
+        return f"Stats: {attempts} attempts | difficulty p={p_value:.2f} | discrimination r={disc_text} | picks {picks}"
+
+    def row_map(self):
+        # Use the exact row_map structure the edit page expects
+        r_id, ques, o1, o2, o3, o4, ans, cat, sub = self.row[:9]
+        return (r_id, cat, sub, ques, o1, o2, o3, o4, ans)
+
+
+class VirtualQuestionList(ctk.CTkFrame):
+    """Scrollable question list that only builds cards for the rows in view.
+    Rows come from a pager (see database_manager.QuestionPager) and are fetched page by page as you scroll."""
+
+    def __init__(self, master, edit_cmd, delete_cmd, **kwargs):
+        super().__init__(master, **kwargs)
+        self.edit_cmd = edit_cmd
+        self.delete_cmd = delete_cmd
+        self.pager = None
+        self.rows = []
+        self.total = None
+        self.first = 0
+        self.cards = []
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y", padx=(0, 5), pady=5)
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self.viewport.pack(side="left", fill="both", expand=True)
+        self.empty_lbl = ctk.CTkLabel(self.viewport, text="No questions found.")
+
+        self.viewport.bind("<Configure>", lambda e: self.render())
+        # Global wheel bindings (like CTkScrollableFrame), the handler ignores events outside this list.
+        # The ids are kept so destroy() can remove exactly these handlers again.
+        self._wheel_bindings = [(seq, self.bind_all(seq, self._on_wheel, add="+"))
+                                for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>")]
+
+    def destroy(self):
+        # tkinter's unbind_all() would also drop other widgets' handlers, so only our lines are cut from the script
+        for seq, funcid in self._wheel_bindings:
+            try:
+                script = self.tk.call("bind", "all", seq)
+                kept = [line for line in script.split("\n") if funcid not in line]
+                self.tk.call("bind", "all", seq, "\n".join(kept))
+                self.deletecommand(funcid)
+            except Exception as e:
+                print(f"Unbind Error: {e}")
+        self._wheel_bindings = []
+        super().destroy()
+
+    def set_source(self, pager, rows=None, total=None):
+        """Starts showing rows from a new pager (e.g. after the search text changes).
+        rows/total can be passed in when the first page was already fetched on a worker thread."""
+        self.pager = pager
+        self.rows = list(rows) if rows is not None else []
+        self.total = total if rows is not None else pager.total()
+        self.first = 0
+        self.render()
+
+    def visible_count(self):
+        height = self.viewport.winfo_height()
+        slot = RefreshableQuestionCard.HEIGHT + 20
+        return max(1, height // slot + 1) if height > 1 else 4
+
+    def _ensure_loaded(self, upto):
+        # Keyset pages are cheap, so a long jump is fetched in one bigger page
+        if self.pager is None:
+            return
+        while len(self.rows) < upto and not self.pager.exhausted:
+            missing = upto - len(self.rows)
+            page = self.pager.next_page(limit=max(self.pager.page_size, min(missing, 5000)))
+            if not page:
+                break
+            self.rows.extend(page)
+
+    def _known_count(self):
+        if self.total is not None:
+            return self.total
+        # Unknown total (search): leave room for one more page until the pager runs out
+        return len(self.rows) + (0 if self.pager is None or self.pager.exhausted else self.pager.page_size)
+
+    def render(self):
+        if not self.winfo_exists():
+            return
+        count = self.visible_count()
+        self._ensure_loaded(self.first + count)
+        # Clamp the window to the rows that exist
+        self.first = max(0, min(self.first, max(0, len(self.rows) - count)))
+        window = self.rows[self.first:self.first + count]
+
+        # Grow the card pool if the viewport got taller, never rebuild existing cards
+        while len(self.cards) < len(window):
+            self.cards.append(RefreshableQuestionCard(self.viewport, self.edit_cmd, self.delete_cmd))
+        for i, card in enumerate(self.cards):
+            if i < len(window):
+                card.bind_row(window[i])
+                if not card.winfo_ismapped():
+                    card.pack(fill="x", pady=10, padx=20)
+            elif card.winfo_ismapped():
+                card.pack_forget()
+
+        if window:
+            self.empty_lbl.pack_forget()
+        else:
+            self.empty_lbl.pack(pady=20)
+
+        known = max(self._known_count(), 1)
+        self.scrollbar.set(self.first / known, min(1.0, (self.first + len(window)) / known))
+
+    def scroll_to(self, first):
+        if first != self.first:
+            self.first = max(0, first)
+            self.render()
+
+    def on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * self._known_count()))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self.visible_count() if args[2] == "pages" else 1)
+            self.scroll_to(self.first + step)
+
+    def _on_wheel(self, event):
+        try:
+            if not self.winfo_exists() or not str(event.widget).startswith(str(self)):
+                return
+        except Exception:
+            return
+        if getattr(event, "num", None) == 4 or event.delta > 0:
+            self.scroll_to(self.first - 1)
+        else:
+            self.scroll_to(self.first + 1)